@@ -6,30 +6,54 @@ Creates and configures the Flask app instance
 from flask import Flask
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from app.config import Config
+from app.utils.json_provider import FastJSONProvider
 import os
 
 # initialize SQLAlchemy (database ORM)
 db = SQLAlchemy()
 
-def create_app():
+# schema migrations (Alembic), scripts live in backend/migrations
+migrate = Migrate(
+    directory=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations'),
+    render_as_batch=True  # SQLite needs table rebuilds for most ALTERs
+)
+
+def create_app(config=None):
     """
     Application factory pattern
     Returns configured Flask app
+
+    Args:
+        config (dict): Optional settings overriding Config
     """
 
     # initialize Flask app
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
-    # configuration
-    app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
+    # configuration (environment driven, see app/config.py)
+    app.config.from_object(Config)
+    if config:
+        app.config.update(config)
 
-    # database configuration
-    basedir = os.path.abspath(os.path.dirname(__file__))
-    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(basedir, "../lms.db")}'
-    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # database engine and pool configuration
+    from app.utils.database import engine_options, register_sqlite_pragmas
+    from app.utils.cooperative import register_cooperative_io
+    from app.utils.profiling import register_query_profiling
+    from app.utils.metrics import register_metrics
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
 
     # initialize extensions
     db.init_app(app)
+    migrate.init_app(app, db)
+
+    with app.app_context():
+        register_cooperative_io(db.engine, app.config)
+        register_sqlite_pragmas(db.engine, app.config)
+        register_query_profiling(app, db.engine)
+        register_metrics(app, db.engine)
 
     # enable CORS (allow frontend to make requests)
     CORS(app, resources={
@@ -41,15 +65,25 @@ def create_app():
     })
 
     # Register blueprints
-    from app.routes import health, database, auth, courses, lessons
+    from app.routes import health, metrics, database, auth, courses, lessons, assignments, exports
     app.register_blueprint(health.bp)
+    app.register_blueprint(metrics.bp)
     app.register_blueprint(database.bp)
     app.register_blueprint(auth.bp)
     app.register_blueprint(courses.bp)
     app.register_blueprint(lessons.bp)
+    app.register_blueprint(assignments.bp)
+    app.register_blueprint(exports.bp)
 
-    # create database tables
-    with app.app_context():
-        db.create_all()
+    # custom CLI commands (flask export ...)
+    from app.commands import register_commands
+    register_commands(app)
+
+    # bring the database schema up to date
+    # (production deployments run 'flask db upgrade' and set DB_AUTO_MIGRATE=0)
+    if app.config['DB_AUTO_MIGRATE']:
+        from app.utils.database import upgrade_database
+        with app.app_context():
+            upgrade_database()
 
     return app
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+CLI Commands
+Custom 'flask' commands for maintenance and reporting jobs
+"""
+
+import sys
+import time
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.utils.export import EXPORTS, EXPORT_FORMATS, generate_export
+from app.utils.ingest import get_submission_queue, drain_submissions
+
+@click.command('export')
+@click.argument('name', type=click.Choice(list(EXPORTS)))
+@click.option('--format', 'export_format', type=click.Choice(list(EXPORT_FORMATS)),
+              default='ndjson', show_default=True, help='Output format.')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, writable=True),
+              help='File to write (default: stdout).')
+@click.option('--course-id', type=int, multiple=True,
+              help='Only export rows of this course (repeatable).')
+@click.option('--batch-size', type=int, default=None,
+              help='Rows fetched per round trip (default: EXPORT_BATCH_SIZE).')
+@with_appcontext
+def export_command(name, export_format, output, course_id, batch_size):
+    """
+    Stream a full table dump as NDJSON or CSV
+
+    Example:
+        flask export enrollments --format csv -o enrollments.csv
+    """
+    chunks = generate_export(
+        name,
+        export_format,
+        course_ids=list(course_id) or None,
+        batch_size=batch_size
+    )
+
+    if output is None:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        return
+
+    with open(output, 'w', encoding='utf-8', newline='') as file:
+        for chunk in chunks:
+            file.write(chunk)
+
+    click.echo(f'Exported {name} to {output}', err=True)
+
+@click.command('drain-submissions')
+@click.option('--batch-size', type=int, default=None,
+              help='Submissions per transaction (default: SUBMISSION_DRAIN_BATCH).')
+@click.option('--once', is_flag=True, help='Drain what is queued now and exit.')
+@with_appcontext
+def drain_submissions_command(batch_size, once):
+    """
+    Move queued submissions into the database
+
+    Runs until interrupted unless --once is given; use it as the
+    dedicated drainer when SUBMISSION_QUEUE_WORKER is off.
+    """
+    queue = get_submission_queue()
+    batch_size = batch_size or current_app.config['SUBMISSION_DRAIN_BATCH']
+    interval = current_app.config['SUBMISSION_DRAIN_INTERVAL_MS'] / 1000
+
+    total = 0
+    while True:
+        processed = drain_submissions(queue, batch_size)
+        total += processed
+        if processed:
+            continue
+        if once:
+            break
+        time.sleep(interval)
+
+    click.echo(f'Drained {total} submissions', err=True)
+
+def register_commands(app):
+    """Add the custom commands to app.cli"""
+    app.cli.add_command(export_command)
+    app.cli.add_command(drain_submissions_command)
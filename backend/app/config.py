@@ -0,0 +1,128 @@
+"""
+Application Configuration
+Settings are read from environment variables with development defaults
+"""
+
+import os
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+def env_int(name, default):
+    """Read an integer environment variable"""
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+def env_bool(name, default):
+    """Read a boolean environment variable ('1', 'true', 'yes', 'on')"""
+    value = os.environ.get(name)
+    if value in (None, ''):
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+def database_uri():
+    """
+    Resolve the database URI from DATABASE_URL
+
+    Falls back to the local SQLite file used in development. The app
+    runs on SQLite (3.35+) and PostgreSQL: its upserts use ON CONFLICT
+    and RETURNING (see app/utils/database.py). Hosting providers still hand out 'postgres://' URLs, which
+    SQLAlchemy only accepts as 'postgresql://'.
+    """
+    uri = os.environ.get('DATABASE_URL')
+    if not uri:
+        return f'sqlite:///{os.path.join(basedir, "../lms.db")}'
+    if uri.startswith('postgres://'):
+        uri = 'postgresql://' + uri[len('postgres://'):]
+    return uri
+
+class Config:
+    """Default configuration, overridable through the environment"""
+
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
+
+    # verified JWTs kept in memory (per worker) until they expire
+    TOKEN_CACHE_SIZE = env_int('TOKEN_CACHE_SIZE', 10000)
+
+    # read-through cache for serialized courses, lessons and enrollments:
+    # 'memory' (LRU per process), 'sqlite' (file shared by the processes
+    # of one host), 'null' or 'package.module:Class'. With 'memory' a
+    # write only invalidates the process that served it, so it is for
+    # single process servers; gunicorn.conf.py defaults to 'sqlite' and
+    # refuses 'memory' with more than one worker. Servers on several
+    # hosts need a network backend.
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+    CACHE_PATH = os.environ.get('CACHE_PATH', '')            # 'sqlite' file, default in the temp dir
+    CACHE_TTL = env_int('CACHE_TTL', 300)                    # seconds
+    CACHE_MAX_ENTRIES = env_int('CACHE_MAX_ENTRIES', 10000)
+
+    # password hashing: scheme for new hashes ('bcrypt' or 'scrypt'),
+    # cost parameters and the worker pool it runs on; stored hashes with
+    # another scheme or cost are upgraded on the next successful login
+    PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'bcrypt')
+    BCRYPT_ROUNDS = env_int('BCRYPT_ROUNDS', 12)
+    SCRYPT_LOG_N = env_int('SCRYPT_LOG_N', 14)
+    SCRYPT_R = env_int('SCRYPT_R', 8)
+    SCRYPT_P = env_int('SCRYPT_P', 1)
+    PASSWORD_HASH_WORKERS = env_int('PASSWORD_HASH_WORKERS', max(1, (os.cpu_count() or 2) // 2))
+    PASSWORD_HASH_QUEUE = env_int('PASSWORD_HASH_QUEUE', 32)
+    PASSWORD_HASH_RETRY_AFTER = env_int('PASSWORD_HASH_RETRY_AFTER', 1)  # seconds
+
+    # database
+    SQLALCHEMY_DATABASE_URI = database_uri()
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # submission ingestion: 'direct' inserts in the request, 'queue'
+    # appends to a local queue file and answers 202 with a receipt ID;
+    # the queue is drained in batches by a background thread per
+    # process (SUBMISSION_QUEUE_WORKER) or by 'flask drain-submissions'
+    SUBMISSION_INGEST = os.environ.get('SUBMISSION_INGEST', 'direct')
+    SUBMISSION_QUEUE_PATH = os.environ.get('SUBMISSION_QUEUE_PATH',
+                                           os.path.join(basedir, '../submission_queue.db'))
+    SUBMISSION_QUEUE_WORKER = env_bool('SUBMISSION_QUEUE_WORKER', True)
+    SUBMISSION_DRAIN_BATCH = env_int('SUBMISSION_DRAIN_BATCH', 200)
+    SUBMISSION_DRAIN_INTERVAL_MS = env_int('SUBMISSION_DRAIN_INTERVAL_MS', 500)
+    SUBMISSION_CLAIM_TIMEOUT = env_int('SUBMISSION_CLAIM_TIMEOUT', 60)   # seconds
+
+    # rows fetched per round trip by the streaming exports
+    EXPORT_BATCH_SIZE = env_int('EXPORT_BATCH_SIZE', 1000)
+
+    # per-request SQL profiling: query count and time in a Server-Timing
+    # header, a JSON log line (app.utils.profiling logger) at WARNING for
+    # slow statements and statement shapes repeated more than the N+1
+    # threshold in one request, at INFO for every request with LOG_ALL
+    QUERY_PROFILING = env_bool('QUERY_PROFILING', True)
+    QUERY_PROFILING_SERVER_TIMING = env_bool('QUERY_PROFILING_SERVER_TIMING', True)
+    QUERY_PROFILING_LOG_ALL = env_bool('QUERY_PROFILING_LOG_ALL', False)
+    QUERY_SLOW_MS = env_int('QUERY_SLOW_MS', 200)
+    QUERY_N_PLUS_ONE_THRESHOLD = env_int('QUERY_N_PLUS_ONE_THRESHOLD', 10)
+
+    # Prometheus metrics at /metrics, counted per worker; prefork workers
+    # share them through snapshot files in METRICS_DIR (gunicorn.conf.py
+    # sets one up). With METRICS_TOKEN scrapers must send it as a
+    # bearer token.
+    METRICS_ENABLED = env_bool('METRICS_ENABLED', True)
+    METRICS_DIR = os.environ.get('METRICS_DIR', '')
+    METRICS_FLUSH_INTERVAL_MS = env_int('METRICS_FLUSH_INTERVAL_MS', 1000)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+    # apply pending migrations when the app starts
+    DB_AUTO_MIGRATE = env_bool('DB_AUTO_MIGRATE', True)
+
+    # connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE = env_int('DB_POOL_SIZE', 10)
+    DB_MAX_OVERFLOW = env_int('DB_MAX_OVERFLOW', 20)
+    DB_POOL_TIMEOUT = env_int('DB_POOL_TIMEOUT', 30)         # seconds
+    DB_POOL_RECYCLE = env_int('DB_POOL_RECYCLE', 1800)       # seconds, -1 disables
+    DB_POOL_PRE_PING = env_bool('DB_POOL_PRE_PING', True)
+
+    # in gevent workers, let database waits yield to other requests
+    # (psycogreen for PostgreSQL; SQLite queries on native threads only
+    # with SQLITE_THREADED_IO, see app/utils/cooperative.py)
+    DB_COOPERATIVE_IO = env_bool('DB_COOPERATIVE_IO', True)
+    SQLITE_THREADED_IO = env_bool('SQLITE_THREADED_IO', False)
+
+    # SQLite tuning, applied to every new connection
+    SQLITE_WAL = env_bool('SQLITE_WAL', True)
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT_MS = env_int('SQLITE_BUSY_TIMEOUT_MS', 5000)
+    SQLITE_MMAP_SIZE = env_int('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)
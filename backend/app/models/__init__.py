@@ -10,6 +10,8 @@ from app.models.assignment import Assignment
 from app.models.enrollment import Enrollment
 from app.models.submission import Submission
 from app.models.progress import Progress
+from app.models.course_progress import CourseProgress
+from app.models.catalog_version import CatalogVersion
 
 __all__ = [
     'User',
@@ -18,5 +20,7 @@ __all__ = [
     'Assignment',
     'Enrollment',
     'Submission',
-    'Progress'
+    'Progress',
+    'CourseProgress',
+    'CatalogVersion'
 ]
\ No newline at end of file
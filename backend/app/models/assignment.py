@@ -17,6 +17,10 @@ class Assignment(db.Model):
     max_points = db.Column(db.Integer, default=100)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_assignments_course_id', 'course_id'),
+    )
+    
     # Relationships
     submissions = db.relationship('Submission', backref='assignment', lazy=True, cascade='all, delete-orphan')
     
@@ -0,0 +1,47 @@
+"""
+Catalog Version Model
+Single counter row bumped by every course write, used for catalog ETags
+"""
+
+from sqlalchemy import event
+from app import db
+from app.models.course import Course
+from app.utils.database import upsert_insert
+
+CATALOG_VERSION_ID = 1
+
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_version'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=1)
+    
+    def __repr__(self):
+        return f'<CatalogVersion {self.version}>'
+
+def bump_catalog_version(connection):
+    """
+    Increment the catalog version inside the current transaction
+    
+    Upserts the row, so a database seeded without it still gets one.
+    Concurrent course writes queue on this row until they commit;
+    course writes are rare next to catalog reads.
+    
+    Args:
+        connection (Connection): Connection of the flush
+    """
+    statement = upsert_insert(CatalogVersion).values(id=CATALOG_VERSION_ID, version=1)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=['id'],
+        set_={'version': CatalogVersion.version + 1}
+    ))
+
+# Every change to a course row moves the version: creating, editing and
+# deleting courses, and lesson writes (they touch course.updated_at, so
+# lesson counts are covered). Only ORM flushes are seen; bulk SQL
+# writes to courses have to call bump_catalog_version() themselves.
+@event.listens_for(Course, 'after_insert')
+@event.listens_for(Course, 'after_update')
+@event.listens_for(Course, 'after_delete')
+def course_written(mapper, connection, target):
+    bump_catalog_version(connection)
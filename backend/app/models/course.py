@@ -14,11 +14,23 @@ class Course(db.Model):
     description = db.Column(db.Text, nullable=True)
     instructor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # row version used for ETags, bumped in SQL by every UPDATE (no
+    # optimistic locking: concurrent writes to one row both succeed)
+    version = db.Column(db.Integer, nullable=False, server_default='1',
+                        onupdate=db.literal_column('version') + 1)
+    
+    __table_args__ = (
+        db.Index('ix_courses_instructor_id', 'instructor_id'),
+        # catalog keyset pagination: ORDER BY created_at, id
+        db.Index('ix_courses_created_at_id', 'created_at', 'id'),
+    )
     
     # Relationships
     lessons = db.relationship('Lesson', backref='course', lazy=True, cascade='all, delete-orphan')
     assignments = db.relationship('Assignment', backref='course', lazy=True, cascade='all, delete-orphan')
     enrollments = db.relationship('Enrollment', backref='course', lazy=True, cascade='all, delete-orphan')
+    progress_rollups = db.relationship('CourseProgress', backref='course', lazy=True, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Course {self.title}>'
@@ -29,5 +41,6 @@ class Course(db.Model):
             'title': self.title,
             'description': self.description,
             'instructor_id': self.instructor_id,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
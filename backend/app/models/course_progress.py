@@ -0,0 +1,32 @@
+"""
+Course Progress Model
+Per-student completion rollup for a course, maintained from Progress
+"""
+
+from app import db
+
+class CourseProgress(db.Model):
+    __tablename__ = 'course_progress'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
+    completed_count = db.Column(db.Integer, nullable=False, default=0)
+    last_activity = db.Column(db.DateTime, nullable=True)
+    
+    # one rollup row per student per course
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'course_id', name='unique_course_progress'),
+        db.Index('ix_course_progress_course_id', 'course_id'),
+    )
+    
+    def __repr__(self):
+        return f'<CourseProgress student={self.student_id} course={self.course_id} completed={self.completed_count}>'
+    
+    def to_dict(self):
+        return {
+            'student_id': self.student_id,
+            'course_id': self.course_id,
+            'completed_count': self.completed_count,
+            'last_activity': self.last_activity.isoformat() if self.last_activity else None
+        }
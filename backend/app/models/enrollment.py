@@ -17,6 +17,8 @@ class Enrollment(db.Model):
     # ensure a student can only enroll once per course
     __table_args__ = (
         db.UniqueConstraint('student_id', 'course_id', name='unique_enrollment'),
+        # the unique index leads with student_id, course lookups need their own
+        db.Index('ix_enrollments_course_id', 'course_id'),
     )
     
     def __repr__(self):
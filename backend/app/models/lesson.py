@@ -4,6 +4,7 @@ Represents individual lessons within courses
 """
 
 from app import db
+from sqlalchemy.orm import deferred
 from datetime import datetime
 
 class Lesson(db.Model):
@@ -12,9 +13,19 @@ class Lesson(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     course_id = db.Column(db.Integer, db.ForeignKey('courses.id'), nullable=False)
     title = db.Column(db.String(200), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    content = deferred(db.Column(db.Text, nullable=False))  # loaded only when accessed
     order_index = db.Column(db.Integer, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # row version used for ETags, bumped in SQL by every UPDATE (no
+    # optimistic locking: concurrent writes to one row both succeed)
+    version = db.Column(db.Integer, nullable=False, server_default='1',
+                        onupdate=db.literal_column('version') + 1)
+    
+    # lessons are always listed by order_index within a course
+    __table_args__ = (
+        db.Index('ix_lessons_course_id_order_index', 'course_id', 'order_index'),
+    )
     
     # relationships
     progress = db.relationship('Progress', backref='lesson', lazy=True, cascade='all, delete-orphan')
@@ -29,5 +40,14 @@ class Lesson(db.Model):
             'title': self.title,
             'content': self.content,
             'order_index': self.order_index,
-            'created_at': self.created_at.isoformat()
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def to_outline_dict(self):
+        """Lightweight representation for course pages (no content)"""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'order_index': self.order_index
         }
\ No newline at end of file
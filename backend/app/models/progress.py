@@ -18,6 +18,7 @@ class Progress(db.Model):
     # ensure one progress record per student per lesson
     __table_args__ = (
         db.UniqueConstraint('student_id', 'lesson_id', name='unique_progress'),
+        db.Index('ix_progress_lesson_id', 'lesson_id'),
     )
     
     def __repr__(self):
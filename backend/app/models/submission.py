@@ -4,6 +4,7 @@ Represents student assignment submissions
 """
 
 from app import db
+from sqlalchemy.orm import deferred
 from datetime import datetime
 
 class Submission(db.Model):
@@ -12,9 +13,19 @@ class Submission(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     assignment_id = db.Column(db.Integer, db.ForeignKey('assignments.id'), nullable=False)
     student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    content = db.Column(db.Text, nullable=False)
+    content = deferred(db.Column(db.Text, nullable=False))  # loaded only when accessed
     submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
     grade = db.Column(db.Integer, nullable=True)  # NULL = not graded yet
+    receipt_id = db.Column(db.String(32), nullable=True)  # ingestion queue receipt, NULL = direct
+    
+    __table_args__ = (
+        db.Index('ix_submissions_assignment_id_student_id', 'assignment_id', 'student_id'),
+        db.Index('ix_submissions_student_id', 'student_id'),
+        # per assignment listing in submission order (keyset pagination)
+        db.Index('ix_submissions_assignment_id_submitted_at', 'assignment_id', 'submitted_at'),
+        # a queued submission is stored once, however often it is drained
+        db.Index('ix_submissions_receipt_id', 'receipt_id', unique=True),
+    )
     
     def __repr__(self):
         return f'<Submission assignment={self.assignment_id} student={self.student_id}>'
@@ -0,0 +1,634 @@
+"""
+Assignment Routes
+Assignments, student submissions and grading
+"""
+
+from flask import Blueprint, current_app, request, jsonify
+from sqlalchemy import and_, bindparam, case, false, func, select, tuple_, update
+from datetime import datetime, timezone
+from app import db
+from app.models.user import User
+from app.models.course import Course
+from app.models.assignment import Assignment
+from app.models.submission import Submission
+from app.utils.auth import token_required, role_required
+from app.utils.pagination import parse_limit, encode_cursor, decode_cursor, parse_fields
+from app.utils.membership import is_enrolled
+from app.utils.ingest import get_submission_queue, wake_drain_worker
+from app.utils.serializers import RowSchema
+
+bp = Blueprint('assignments', __name__, url_prefix='/api/assignments')
+
+# most grades accepted by one bulk grading request
+MAX_GRADES_PER_REQUEST = 1000
+
+# submitted after the due date (computed by the database)
+IS_LATE = case(
+    (and_(Assignment.due_date.isnot(None), Submission.submitted_at > Assignment.due_date), True),
+    else_=False
+)
+
+# fields a submission listing can contain (see the 'fields' query parameter)
+SUBMISSION_SCHEMA = RowSchema(
+    id=Submission.id,
+    assignment_id=Submission.assignment_id,
+    student_id=Submission.student_id,
+    student_name=User.full_name,
+    student_email=User.email,
+    submitted_at=Submission.submitted_at,
+    grade=Submission.grade,
+    is_late=IS_LATE,
+    content=Submission.content
+)
+
+# content can be large, it is only returned when asked for
+DEFAULT_SUBMISSION_FIELDS = [name for name in SUBMISSION_SCHEMA.names if name != 'content']
+
+def parse_due_date(value):
+    """
+    Parse an ISO 8601 due date as naive UTC (None clears it)
+    """
+    if value is None:
+        return None
+    
+    due_date = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if due_date.tzinfo is not None:
+        due_date = due_date.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return due_date
+
+def parse_max_points(value):
+    """Validate max_points (positive integer)"""
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError('max_points must be a positive integer')
+    return value
+
+def submissions_query(assignment_id, fields):
+    """
+    Select the given submission fields of one assignment
+    
+    The lateness flag is evaluated by the database against the
+    assignment's due date, so listings never load Assignment objects.
+    """
+    names = list(dict.fromkeys(['id', 'submitted_at'] + fields))
+    return (
+        select(*SUBMISSION_SCHEMA.columns(names))
+        .select_from(Submission)
+        .join(Assignment, Assignment.id == Submission.assignment_id)
+        .outerjoin(User, User.id == Submission.student_id)
+        .where(Submission.assignment_id == assignment_id)
+    )
+
+def dump_submissions(rows, fields):
+    """Rows from submissions_query -> response dicts"""
+    submissions = RowSchema.dump(rows, fields)
+    for submission in submissions:
+        if 'is_late' in submission:
+            submission['is_late'] = bool(submission['is_late'])
+    return submissions
+
+def get_owned_assignment(assignment_id, current_user, action):
+    """
+    Load an assignment the current instructor owns
+    
+    Returns:
+        tuple: (assignment, error response or None)
+    """
+    assignment = Assignment.query.get(assignment_id)
+    if not assignment:
+        return None, (jsonify({'error': 'Assignment not found'}), 404)
+    
+    course = Course.query.get(assignment.course_id)
+    if course.instructor_id != current_user['user_id']:
+        return None, (jsonify({'error': f'You can only {action} assignments in your own courses'}), 403)
+    
+    return assignment, None
+
+@bp.route('', methods=['POST'])
+@token_required
+@role_required('instructor')
+def create_assignment(current_user):
+    """
+    Create a new assignment (instructors only)
+    
+    Expected JSON:
+    {
+        "course_id": 1,
+        "title": "Homework 1",
+        "description": "Solve the exercises...",
+        "due_date": "2026-11-01T23:59:00Z",
+        "max_points": 100
+    }
+    """
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['course_id', 'title', 'description']
+        for field in required_fields:
+            if field not in data:
+                return jsonify({'error': f'{field} is required'}), 400
+        
+        try:
+            due_date = parse_due_date(data.get('due_date'))
+            max_points = parse_max_points(data.get('max_points', 100))
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Check if course exists
+        course = Course.query.get(data['course_id'])
+        if not course:
+            return jsonify({'error': 'Course not found'}), 404
+        
+        # Check if current user is the course instructor
+        if course.instructor_id != current_user['user_id']:
+            return jsonify({'error': 'You can only add assignments to your own courses'}), 403
+        
+        new_assignment = Assignment(
+            course_id=course.id,
+            title=data['title'].strip(),
+            description=data['description'].strip(),
+            due_date=due_date,
+            max_points=max_points
+        )
+        
+        db.session.add(new_assignment)
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Assignment created successfully',
+            'assignment': new_assignment.to_dict()
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('', methods=['GET'])
+@token_required
+def get_course_assignments(current_user):
+    """
+    List the assignments of a course, by due date
+    
+    Query parameters:
+        course_id: course to list (required)
+    
+    Instructors (own courses) also get submission_count and
+    ungraded_count, students get their own submission_count; the
+    counts come from one grouped subquery.
+    """
+    try:
+        course_id = request.args.get('course_id', type=int)
+        if course_id is None:
+            return jsonify({'error': 'course_id is required'}), 400
+        
+        course = Course.query.get(course_id)
+        if not course:
+            return jsonify({'error': 'Course not found'}), 404
+        
+        # Check access permissions
+        if current_user['role'] == 'student':
+            if not is_enrolled(current_user['user_id'], course_id):
+                return jsonify({'error': 'You must be enrolled in this course to view assignments'}), 403
+        elif course.instructor_id != current_user['user_id']:
+            return jsonify({'error': 'Access denied'}), 403
+        
+        counts = (
+            select(
+                Submission.assignment_id.label('assignment_id'),
+                func.count(Submission.id).label('submission_count'),
+                func.count(case((Submission.grade.is_(None), 1))).label('ungraded_count')
+            )
+            .join(Assignment, Assignment.id == Submission.assignment_id)
+            .where(Assignment.course_id == course_id)
+            .group_by(Submission.assignment_id)
+        )
+        if current_user['role'] == 'student':
+            counts = counts.where(Submission.student_id == current_user['user_id'])
+        counts = counts.subquery()
+        
+        rows = db.session.execute(
+            select(
+                Assignment,
+                func.coalesce(counts.c.submission_count, 0),
+                func.coalesce(counts.c.ungraded_count, 0)
+            )
+            .outerjoin(counts, counts.c.assignment_id == Assignment.id)
+            .where(Assignment.course_id == course_id)
+            # undated assignments last
+            .order_by(Assignment.due_date.is_(None), Assignment.due_date, Assignment.id)
+        ).all()
+        
+        assignments_data = []
+        for assignment, submission_count, ungraded_count in rows:
+            assignment_dict = assignment.to_dict()
+            assignment_dict['submission_count'] = submission_count
+            if current_user['role'] == 'instructor':
+                assignment_dict['ungraded_count'] = ungraded_count
+            assignments_data.append(assignment_dict)
+        
+        return jsonify({
+            'status': 'success',
+            'assignments': assignments_data
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:assignment_id>', methods=['GET'])
+@token_required
+def get_assignment(current_user, assignment_id):
+    """
+    Get a specific assignment
+    Students must be enrolled in the course
+    """
+    try:
+        assignment = Assignment.query.get(assignment_id)
+        
+        if not assignment:
+            return jsonify({'error': 'Assignment not found'}), 404
+        
+        # Check access permissions
+        if current_user['role'] == 'student':
+            if not is_enrolled(current_user['user_id'], assignment.course_id):
+                return jsonify({'error': 'You must be enrolled in this course to view assignments'}), 403
+        else:
+            course = Course.query.get(assignment.course_id)
+            if course.instructor_id != current_user['user_id']:
+                return jsonify({'error': 'Access denied'}), 403
+        
+        return jsonify({
+            'status': 'success',
+            'assignment': assignment.to_dict()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:assignment_id>', methods=['PUT'])
+@token_required
+@role_required('instructor')
+def update_assignment(current_user, assignment_id):
+    """
+    Update an assignment (instructors only, own courses)
+    """
+    try:
+        assignment, error = get_owned_assignment(assignment_id, current_user, 'edit')
+        if error:
+            return error
+        
+        data = request.get_json()
+        
+        try:
+            if 'due_date' in data:
+                assignment.due_date = parse_due_date(data['due_date'])
+            if 'max_points' in data:
+                assignment.max_points = parse_max_points(data['max_points'])
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if 'title' in data:
+            assignment.title = data['title'].strip()
+        if 'description' in data:
+            assignment.description = data['description'].strip()
+        
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Assignment updated successfully',
+            'assignment': assignment.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:assignment_id>', methods=['DELETE'])
+@token_required
+@role_required('instructor')
+def delete_assignment(current_user, assignment_id):
+    """
+    Delete an assignment and its submissions (instructors only, own courses)
+    """
+    try:
+        assignment, error = get_owned_assignment(assignment_id, current_user, 'delete')
+        if error:
+            return error
+        
+        # one DELETE for the submissions instead of loading each of them
+        db.session.execute(
+            Submission.__table__.delete().where(Submission.assignment_id == assignment_id)
+        )
+        db.session.delete(assignment)
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Assignment deleted successfully'
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:assignment_id>/submissions', methods=['POST'])
+@token_required
+@role_required('student')
+def submit_assignment(current_user, assignment_id):
+    """
+    Submit work for an assignment (students only, enrolled)
+    
+    Expected JSON:
+    {
+        "content": "My answer..."
+    }
+    
+    Every submit is kept; the response says whether it was late.
+    
+    With SUBMISSION_INGEST = 'queue' the submission is appended to the
+    ingestion queue instead and answered with 202 and a receipt_id to
+    poll at GET /api/assignments/receipts/<receipt_id>. Lateness is
+    then judged by the receipt time.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        content = data.get('content')
+        
+        if not isinstance(content, str) or not content.strip():
+            return jsonify({'error': 'content is required'}), 400
+        
+        assignment = Assignment.query.get(assignment_id)
+        if not assignment:
+            return jsonify({'error': 'Assignment not found'}), 404
+        
+        if not is_enrolled(current_user['user_id'], assignment.course_id):
+            return jsonify({'error': 'You must be enrolled in this course'}), 403
+        
+        if current_app.config['SUBMISSION_INGEST'] == 'queue':
+            receipt = get_submission_queue().enqueue(assignment_id, current_user['user_id'], content.strip())
+            wake_drain_worker()
+            
+            return jsonify({
+                'status': 'success',
+                'message': 'Submission received',
+                'receipt': receipt
+            }), 202
+        
+        submission = Submission(
+            assignment_id=assignment_id,
+            student_id=current_user['user_id'],
+            content=content.strip()
+        )
+        db.session.add(submission)
+        db.session.flush()
+        
+        fields = DEFAULT_SUBMISSION_FIELDS
+        row = db.session.execute(
+            submissions_query(assignment_id, fields).where(Submission.id == submission.id)
+        ).one()
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Assignment submitted successfully',
+            'submission': dump_submissions([row], fields)[0]
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/receipts/<receipt_id>', methods=['GET'])
+@token_required
+@role_required('student')
+def get_submission_receipt(current_user, receipt_id):
+    """
+    Poll a queued submission (students only, own receipts)
+    
+    status is 'queued' until the submission is stored ('stored', with
+    the submission) or turned down ('rejected', with the reason).
+    """
+    try:
+        receipt = get_submission_queue().receipt(receipt_id)
+        
+        if not receipt or receipt['student_id'] != current_user['user_id']:
+            return jsonify({'error': 'Receipt not found'}), 404
+        
+        if receipt['status'] == 'stored':
+            fields = DEFAULT_SUBMISSION_FIELDS
+            row = db.session.execute(
+                submissions_query(receipt['assignment_id'], fields)
+                .where(Submission.id == receipt['submission_id'])
+            ).first()
+            receipt['submission'] = dump_submissions([row], fields)[0] if row else None
+        
+        return jsonify({
+            'status': 'success',
+            'receipt': receipt
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def submissions_page_query(query, cursor, limit):
+    """
+    Order a submissions query oldest first and cut the page after a cursor
+    
+    One extra row is fetched to know whether another page exists.
+    
+    Args:
+        query (Select): Statement from submissions_query()
+        cursor (tuple): (submitted_at, id) of the previous page's last submission
+        limit (int): Page size
+    
+    Returns:
+        Select: Page statement
+    """
+    if cursor:
+        query = query.where(tuple_(Submission.submitted_at, Submission.id) > tuple_(*cursor))
+    return query.order_by(Submission.submitted_at, Submission.id).limit(limit + 1)
+
+@bp.route('/<int:assignment_id>/submissions', methods=['GET'])
+@token_required
+@role_required('instructor')
+def get_submissions(current_user, assignment_id):
+    """
+    List the submissions of an assignment, oldest first, one page at a time
+    (instructors only, own courses)
+    
+    Query parameters:
+        limit: page size (default 50, max 200)
+        cursor: 'next_cursor' from the previous page
+        status: 'graded', 'ungraded' or 'late'
+        fields: comma separated subset of the submission fields
+                (content is only returned when requested)
+    
+    Pages are read from the (assignment_id, submitted_at) index.
+    """
+    try:
+        args = request.args
+        try:
+            limit = parse_limit(args.get('limit'))
+            if args.get('fields'):
+                fields = parse_fields(args['fields'], SUBMISSION_SCHEMA.names)
+            else:
+                fields = DEFAULT_SUBMISSION_FIELDS
+            cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+            status = args.get('status')
+            if status not in (None, 'graded', 'ungraded', 'late'):
+                raise ValueError("status must be 'graded', 'ungraded' or 'late'")
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        assignment, error = get_owned_assignment(assignment_id, current_user, 'view submissions of')
+        if error:
+            return error
+        
+        query = submissions_query(assignment_id, fields)
+        
+        if status == 'graded':
+            query = query.where(Submission.grade.isnot(None))
+        elif status == 'ungraded':
+            query = query.where(Submission.grade.is_(None))
+        elif status == 'late':
+            if assignment.due_date is None:
+                query = query.where(false())
+            else:
+                query = query.where(Submission.submitted_at > Assignment.due_date)
+        
+        rows = db.session.execute(submissions_page_query(query, cursor, limit)).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        next_cursor = None
+        if has_more:
+            next_cursor = encode_cursor(rows[-1].submitted_at, rows[-1].id)
+        
+        return jsonify({
+            'status': 'success',
+            'submissions': dump_submissions(rows, fields),
+            'next_cursor': next_cursor
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:assignment_id>/submissions/mine', methods=['GET'])
+@token_required
+@role_required('student')
+def get_my_submissions(current_user, assignment_id):
+    """
+    Get the current student's submissions for an assignment, newest first
+    """
+    try:
+        assignment = Assignment.query.get(assignment_id)
+        if not assignment:
+            return jsonify({'error': 'Assignment not found'}), 404
+        
+        if not is_enrolled(current_user['user_id'], assignment.course_id):
+            return jsonify({'error': 'You must be enrolled in this course'}), 403
+        
+        fields = SUBMISSION_SCHEMA.names
+        rows = db.session.execute(
+            submissions_query(assignment_id, fields)
+            .where(Submission.student_id == current_user['user_id'])
+            .order_by(Submission.submitted_at.desc(), Submission.id.desc())
+        ).all()
+        
+        return jsonify({
+            'status': 'success',
+            'submissions': dump_submissions(rows, fields)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:assignment_id>/grades', methods=['PUT'])
+@token_required
+@role_required('instructor')
+def bulk_grade(current_user, assignment_id):
+    """
+    Grade many submissions at once (instructors only, own courses)
+    
+    Expected JSON:
+    {
+        "grades": [
+            {"submission_id": 1, "grade": 95},
+            {"submission_id": 2, "grade": null}
+        ]
+    }
+    
+    A null grade marks the submission as ungraded again. Grades are
+    checked against max_points, unknown submissions (or ones of other
+    assignments) are reported as rejected, and all updates run as one
+    executemany UPDATE in one transaction.
+    """
+    try:
+        data = request.get_json(silent=True)
+        entries = data.get('grades') if isinstance(data, dict) else None
+        
+        if not isinstance(entries, list) or not entries:
+            return jsonify({'error': 'grades is required'}), 400
+        if len(entries) > MAX_GRADES_PER_REQUEST:
+            return jsonify({'error': f'At most {MAX_GRADES_PER_REQUEST} grades per request'}), 400
+        
+        assignment, error = get_owned_assignment(assignment_id, current_user, 'grade')
+        if error:
+            return error
+        
+        # the last grade given for a submission wins
+        grades = {}
+        max_points = assignment.max_points
+        try:
+            for entry in entries:
+                if not isinstance(entry, dict):
+                    raise ValueError('each grade must be an object')
+                submission_id = int(entry['submission_id'])
+                grade = entry.get('grade')
+                if grade is not None:
+                    if isinstance(grade, bool) or not isinstance(grade, int):
+                        raise ValueError('grade must be an integer or null')
+                    if grade < 0:
+                        raise ValueError('grade must not be negative')
+                    # max_points is nullable: no upper bound when unset
+                    if max_points is not None and grade > max_points:
+                        raise ValueError(f'grade must be between 0 and {max_points}')
+                grades[submission_id] = grade
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid grade: {e}'}), 400
+        
+        # submissions (among the requested ones) of this assignment
+        valid = set(db.session.execute(
+            select(Submission.id)
+            .where(Submission.assignment_id == assignment_id, Submission.id.in_(list(grades)))
+        ).scalars())
+        
+        graded = sorted(valid)
+        rejected = sorted(submission_id for submission_id in grades if submission_id not in valid)
+        
+        if graded:
+            submissions = Submission.__table__
+            db.session.execute(
+                update(submissions)
+                .where(submissions.c.id == bindparam('submission_id'))
+                .values(grade=bindparam('new_grade')),
+                [
+                    {'submission_id': submission_id, 'new_grade': grades[submission_id]}
+                    for submission_id in graded
+                ]
+            )
+        
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(graded)} submissions graded',
+            'graded': graded,
+            'rejected': rejected
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
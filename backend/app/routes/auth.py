@@ -6,7 +6,10 @@ User registration and login
 from flask import Blueprint, request, jsonify
 from app import db
 from app.models.user import User
-from app.utils.auth import hash_password, verify_password, generate_token, token_required
+from app.utils.auth import (
+    hash_password, verify_password, password_needs_rehash, generate_token, token_required
+)
+from app.utils.workers import PoolBusyError
 import re
 
 bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -16,6 +19,10 @@ def validate_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
+def busy_response(error):
+    """503 response telling the client when to retry"""
+    return jsonify({'error': str(error)}), 503, {'Retry-After': str(error.retry_after)}
+
 @bp.route('/register', methods=['POST'])
 def register():
     """
@@ -86,6 +93,10 @@ def register():
             'token': token
         }), 201
         
+    except PoolBusyError as e:
+        db.session.rollback()
+        return busy_response(e)
+        
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -121,6 +132,14 @@ def login():
         if not verify_password(password, user.password_hash):
             return jsonify({'error': 'Invalid email or password'}), 401
         
+        # Upgrade the stored hash if it uses an old scheme or cost
+        if password_needs_rehash(user.password_hash):
+            try:
+                user.password_hash = hash_password(password)
+                db.session.commit()
+            except PoolBusyError:
+                pass  # keep the old hash, try again on the next login
+        
         # Generate token
         token = generate_token(user.id, user.role)
         
@@ -131,6 +150,9 @@ def login():
             'token': token
         }), 200
         
+    except PoolBusyError as e:
+        return busy_response(e)
+        
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -4,14 +4,173 @@ Course creation, listing, and enrollment
 """
 
 from flask import Blueprint, request, jsonify
+from sqlalchemy import and_, false, func, literal, select, tuple_
+from collections import Counter
+from datetime import datetime
+import csv
+import io
 from app import db
 from app.models.user import User
 from app.models.course import Course
+from app.models.lesson import Lesson
 from app.models.enrollment import Enrollment
+from app.models.course_progress import CourseProgress
+from app.models.catalog_version import CatalogVersion, CATALOG_VERSION_ID
 from app.utils.auth import token_required, role_required
+from app.utils.pagination import parse_limit, encode_cursor, decode_cursor, parse_fields
+from app.utils.database import insert_ignore
+from app.utils.http_cache import compute_etag, conditional_response
+from app.utils.model_cache import cached_course
+from app.utils.membership import is_enrolled, invalidate_membership
+from app.utils.serializers import RowSchema
 
 bp = Blueprint('courses', __name__, url_prefix='/api/courses')
 
+# rows inserted per statement by the bulk enrollment endpoint
+BULK_ENROLL_CHUNK_SIZE = 500
+
+# fields a catalog entry can contain (see the 'fields' query parameter)
+CATALOG_FIELDS = [
+    'id', 'title', 'description', 'instructor_id', 'created_at',
+    'instructor_name', 'is_enrolled', 'lesson_count'
+]
+
+# same fields as Lesson.to_outline_dict()
+LESSON_OUTLINE_SCHEMA = RowSchema(
+    id=Lesson.id,
+    title=Lesson.title,
+    order_index=Lesson.order_index
+)
+
+def lesson_count_column():
+    """
+    Correlated lesson count of each selected course
+    
+    Counted per row through the lessons(course_id, order_index) index,
+    so a page costs the same however large the lessons table grows
+    """
+    return (
+        select(func.count(Lesson.id))
+        .where(Lesson.course_id == Course.id)
+        .correlate(Course)
+        .scalar_subquery()
+    )
+
+def student_count_column():
+    """
+    Correlated enrollment count of each selected course
+    (through the enrollments(course_id) index)
+    """
+    return (
+        select(func.count(Enrollment.id))
+        .where(Enrollment.course_id == Course.id)
+        .correlate(Course)
+        .scalar_subquery()
+    )
+
+def course_schema(**extra):
+    """
+    RowSchema with the Course.to_dict() fields plus extra columns
+    """
+    return RowSchema(
+        id=Course.id,
+        title=Course.title,
+        description=Course.description,
+        instructor_id=Course.instructor_id,
+        created_at=Course.created_at,
+        updated_at=Course.updated_at,
+        **extra
+    )
+
+def catalog_query(current_user, fields, enrolled_only=False):
+    """
+    Build the set-based course catalog query
+    
+    Selects only the requested catalog fields (plus created_at and id
+    for the cursor) as labeled columns. Lesson counts come from a
+    correlated subquery per course of the page and the enrollment
+    status from a single outer join on the current student's rows.
+    
+    Args:
+        current_user (dict): Decoded token payload
+        fields (list): Catalog fields to return
+        enrolled_only (bool): Only return the student's enrolled courses
+    
+    Returns:
+        Select: Unordered catalog statement
+    """
+    if current_user['role'] == 'student':
+        is_enrolled = Enrollment.id.isnot(None)
+    else:
+        is_enrolled = literal(False)
+    
+    schema = course_schema(
+        instructor_name=func.coalesce(User.full_name, 'Unknown'),
+        lesson_count=lesson_count_column(),
+        is_enrolled=is_enrolled
+    )
+    names = list(dict.fromkeys(['id', 'created_at'] + fields))
+    
+    query = (
+        select(*schema.columns(names))
+        .select_from(Course)
+        .outerjoin(User, User.id == Course.instructor_id)
+    )
+    
+    if current_user['role'] == 'student':
+        enrollment_join = and_(
+            Enrollment.course_id == Course.id,
+            Enrollment.student_id == current_user['user_id']
+        )
+        if enrolled_only:
+            query = query.join(Enrollment, enrollment_join)
+        else:
+            query = query.outerjoin(Enrollment, enrollment_join)
+    elif enrolled_only:
+        # only students have enrollments
+        query = query.where(false())
+    
+    return query
+
+def catalog_page_query(query, cursor, limit):
+    """
+    Order a catalog query newest first and cut the page after a cursor
+    
+    One extra row is fetched to know whether another page exists.
+    
+    Args:
+        query (Select): Statement from catalog_query()
+        cursor (tuple): (created_at, id) of the previous page's last course
+        limit (int): Page size
+    
+    Returns:
+        Select: Page statement
+    """
+    if cursor:
+        query = query.where(tuple_(Course.created_at, Course.id) < tuple_(*cursor))
+    return query.order_by(Course.created_at.desc(), Course.id.desc()).limit(limit + 1)
+
+def catalog_state(current_user):
+    """
+    Cheap fingerprint of everything a catalog page depends on
+    
+    One query of primary key and index lookups: the catalog version
+    (bumped by every course write, see app/models/catalog_version.py),
+    plus the student's enrollment count and latest enrollment.
+    """
+    columns = [
+        select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID).scalar_subquery()
+    ]
+    
+    if current_user['role'] == 'student':
+        student_enrollments = Enrollment.student_id == current_user['user_id']
+        columns += [
+            select(func.count(Enrollment.id)).where(student_enrollments).scalar_subquery(),
+            select(func.max(Enrollment.enrolled_at)).where(student_enrollments).scalar_subquery()
+        ]
+    
+    return tuple(db.session.execute(select(*columns)).one())
+
 @bp.route('', methods=['POST'])
 @token_required
 @role_required('instructor')
@@ -59,38 +218,72 @@ def create_course(current_user):
 @token_required
 def get_all_courses(current_user):
     """
-    Get all available courses
+    Get available courses, newest first, one page at a time
+    
+    Query parameters:
+        limit: page size (default 50, max 200)
+        cursor: 'next_cursor' from the previous page
+        instructor_id: only courses taught by this instructor
+        title: only courses whose title starts with this prefix
+        enrolled: 'true' to only return the student's enrolled courses
+        fields: comma separated subset of the catalog fields
+    
+    Instructor name, lesson count and enrollment status are
+    resolved in a single query instead of per course
+    
+    Supports If-None-Match: the ETag comes from catalog_state(), so
+    an unchanged catalog costs one small query and no serialization.
+    There is no Last-Modified because deleting a course leaves no
+    timestamp behind.
     """
     try:
-        courses = Course.query.all()
-        
-        courses_data = []
-        for course in courses:
-            course_dict = course.to_dict()
+        args = request.args
+        try:
+            limit = parse_limit(args.get('limit'))
+            fields = parse_fields(args.get('fields'), CATALOG_FIELDS)
+            cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+            instructor_id = args.get('instructor_id', type=int)
+            if 'instructor_id' in args and instructor_id is None:
+                raise ValueError('instructor_id must be an integer')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        etag = compute_etag('catalog', current_user['user_id'], current_user['role'],
+                            request.query_string, catalog_state(current_user))
+        
+        enrolled_only = args.get('enrolled', '').lower() in ('1', 'true', 'yes')
+        query = catalog_query(current_user, fields, enrolled_only=enrolled_only)
+        
+        if instructor_id is not None:
+            query = query.where(Course.instructor_id == instructor_id)
+        
+        title_prefix = args.get('title', '').strip()
+        if title_prefix:
+            escaped = title_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            query = query.where(Course.title.like(f'{escaped}%', escape='\\'))
+        
+        def render():
+            rows = db.session.execute(catalog_page_query(query, cursor, limit)).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
             
-            # Add instructor name
-            instructor = User.query.get(course.instructor_id)
-            course_dict['instructor_name'] = instructor.full_name if instructor else 'Unknown'
+            next_cursor = None
+            if has_more:
+                last_course = rows[-1]
+                next_cursor = encode_cursor(last_course.created_at, last_course.id)
             
-            # Add enrollment status for current user
-            if current_user['role'] == 'student':
-                enrollment = Enrollment.query.filter_by(
-                    student_id=current_user['user_id'],
-                    course_id=course.id
-                ).first()
-                course_dict['is_enrolled'] = enrollment is not None
-            else:
-                course_dict['is_enrolled'] = False
+            courses_data = RowSchema.dump(rows, fields)
+            for course_dict in courses_data:
+                if 'is_enrolled' in course_dict:
+                    course_dict['is_enrolled'] = bool(course_dict['is_enrolled'])
             
-            # Add lesson count
-            course_dict['lesson_count'] = len(course.lessons)
-            
-            courses_data.append(course_dict)
+            return jsonify({
+                'status': 'success',
+                'courses': courses_data,
+                'next_cursor': next_cursor
+            }), 200
         
-        return jsonify({
-            'status': 'success',
-            'courses': courses_data
-        }), 200
+        return conditional_response(etag, None, render)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -99,40 +292,58 @@ def get_all_courses(current_user):
 @token_required
 def get_course(current_user, course_id):
     """
-    Get a specific course with its lessons
+    Get a specific course with its lesson outline
+    Lesson content is only returned by GET /api/lessons/<id>
+    
+    The course comes from the read-through cache. Supports conditional
+    GET on the course row version (lesson writes bump it), answering
+    304 before the instructor and lessons are loaded. Last-Modified
+    is only sent to instructors: it cannot reflect enrollment.
     """
     try:
-        course = Course.query.get(course_id)
+        course_entry = cached_course(course_id)
         
-        if not course:
+        if not course_entry:
             return jsonify({'error': 'Course not found'}), 404
         
-        course_dict = course.to_dict()
-        
-        # Add instructor info
-        instructor = User.query.get(course.instructor_id)
-        course_dict['instructor_name'] = instructor.full_name if instructor else 'Unknown'
-        
-        # Add lessons (sorted by order_index)
-        lessons_data = []
-        for lesson in sorted(course.lessons, key=lambda x: x.order_index):
-            lessons_data.append(lesson.to_dict())
-        course_dict['lessons'] = lessons_data
+        course = course_entry['course']
         
         # Check enrollment status
         if current_user['role'] == 'student':
-            enrollment = Enrollment.query.filter_by(
-                student_id=current_user['user_id'],
-                course_id=course.id
-            ).first()
-            course_dict['is_enrolled'] = enrollment is not None
+            enrolled = is_enrolled(current_user['user_id'], course_id)
         else:
-            course_dict['is_enrolled'] = current_user['user_id'] == course.instructor_id
+            enrolled = current_user['user_id'] == course['instructor_id']
         
-        return jsonify({
-            'status': 'success',
-            'course': course_dict
-        }), 200
+        etag = compute_etag('course', course_id, course_entry['version'], current_user['role'], enrolled)
+        
+        # a student's enrollment is not covered by updated_at, so students
+        # revalidate with the ETag only
+        last_modified = None
+        if current_user['role'] != 'student' and course['updated_at']:
+            last_modified = datetime.fromisoformat(course['updated_at'])
+        
+        def render():
+            course_dict = dict(course)
+            
+            # Add instructor info
+            instructor = User.query.get(course['instructor_id'])
+            course_dict['instructor_name'] = instructor.full_name if instructor else 'Unknown'
+            
+            # Add lesson outline (sorted by order_index)
+            lessons = db.session.execute(
+                select(*LESSON_OUTLINE_SCHEMA.columns())
+                .where(Lesson.course_id == course_id)
+                .order_by(Lesson.order_index, Lesson.id)
+            )
+            course_dict['lessons'] = LESSON_OUTLINE_SCHEMA.dump(lessons)
+            course_dict['is_enrolled'] = enrolled
+            
+            return jsonify({
+                'status': 'success',
+                'course': course_dict
+            }), 200
+        
+        return conditional_response(etag, last_modified, render)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -167,6 +378,7 @@ def enroll_in_course(current_user, course_id):
         
         db.session.add(new_enrollment)
         db.session.commit()
+        invalidate_membership([current_user['user_id']])
         
         return jsonify({
             'status': 'success',
@@ -178,6 +390,211 @@ def enroll_in_course(current_user, course_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def read_roster():
+    """
+    Yield ('student_id' | 'email', value) pairs from the request body
+    
+    JSON bodies carry "student_ids" (integers) and/or "emails"
+    (strings) lists; text/csv bodies are streamed row by row and need
+    a 'student_id' or 'email' header column. Malformed rosters raise
+    ValueError.
+    """
+    if request.mimetype == 'text/csv':
+        reader = csv.DictReader(io.TextIOWrapper(request.stream, encoding='utf-8-sig'))
+        columns = [name.strip().lower() for name in (reader.fieldnames or [])]
+        if 'student_id' not in columns and 'email' not in columns:
+            raise ValueError('CSV must have a student_id or email column')
+        
+        reader.fieldnames = columns
+        for row in reader:
+            if row.get('student_id', '').strip():
+                yield 'student_id', int(row['student_id'])
+            elif row.get('email', '').strip():
+                yield 'email', row['email'].strip().lower()
+        return
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValueError('expected a JSON object with student_ids and/or emails')
+    
+    student_ids = data.get('student_ids')
+    emails = data.get('emails')
+    if student_ids is not None and not isinstance(student_ids, list):
+        raise ValueError('student_ids must be a list')
+    if emails is not None and not isinstance(emails, list):
+        raise ValueError('emails must be a list')
+    if not student_ids and not emails:
+        raise ValueError('student_ids or emails is required')
+    
+    for student_id in student_ids or []:
+        if isinstance(student_id, bool) or not isinstance(student_id, int):
+            raise ValueError('student_ids must be integers')
+        yield 'student_id', student_id
+    for email in emails or []:
+        if not isinstance(email, str):
+            raise ValueError('emails must be strings')
+        yield 'email', email.strip().lower()
+
+def resolve_students(key, values):
+    """
+    Look up the student accounts of one chunk of roster entries
+    
+    Returns:
+        dict: student_id or email value -> student ID (unknown values
+        and non-student accounts are left out)
+    """
+    column = User.id if key == 'student_id' else User.email
+    return dict(db.session.execute(
+        select(column, User.id).where(column.in_(values), User.role == 'student')
+    ).all())
+
+def enroll_chunk(course_id, student_ids, enrolled_at):
+    """
+    Enroll one chunk of students with a single INSERT ... SELECT
+    
+    The conflict clause skips students already enrolled.
+    
+    Returns:
+        list: IDs of newly enrolled students
+    """
+    students = select(
+        User.id,
+        literal(course_id),
+        literal(enrolled_at)
+    ).where(User.id.in_(student_ids))
+    
+    statement = insert_ignore(Enrollment, ['student_id', 'course_id']).from_select(
+        ['student_id', 'course_id', 'enrolled_at'], students
+    ).returning(Enrollment.student_id)
+    return list(db.session.execute(statement).scalars())
+
+@bp.route('/<int:course_id>/enrollments/bulk', methods=['POST'])
+@token_required
+@role_required('instructor')
+def bulk_enroll(current_user, course_id):
+    """
+    Enroll a whole roster at once (instructors only, own courses)
+    
+    Expected JSON:
+    {
+        "student_ids": [1, 2, 3],
+        "emails": ["student@example.com"]
+    }
+    
+    or a text/csv body with a 'student_id' or 'email' column.
+    Entries are resolved to student IDs in chunks, so a student
+    listed twice (also once by ID and once by email) is counted
+    once and the repeats as duplicates. The students are then
+    inserted in chunks inside one transaction; already enrolled
+    students are skipped and unknown IDs/emails (or non-student
+    accounts) are reported as invalid.
+    """
+    try:
+        course = Course.query.get(course_id)
+        if not course:
+            return jsonify({'error': 'Course not found'}), 404
+        
+        # Check ownership
+        if course.instructor_id != current_user['user_id']:
+            return jsonify({'error': 'You can only enroll students in your own courses'}), 403
+        
+        enrolled_at = datetime.utcnow()
+        counts = {'received': 0, 'created': 0, 'skipped': 0, 'duplicates': 0, 'invalid': 0}
+        pending = {'student_id': Counter(), 'email': Counter()}
+        student_ids = set()
+        
+        def resolve(key):
+            entries = pending[key]
+            if not entries:
+                return
+            found = resolve_students(key, list(entries))
+            for value, occurrences in entries.items():
+                student_id = found.get(value)
+                if student_id is None:
+                    counts['invalid'] += occurrences
+                elif student_id in student_ids:
+                    counts['duplicates'] += occurrences
+                else:
+                    student_ids.add(student_id)
+                    counts['duplicates'] += occurrences - 1
+            entries.clear()
+        
+        try:
+            for key, value in read_roster():
+                counts['received'] += 1
+                pending[key][value] += 1
+                if len(pending[key]) >= BULK_ENROLL_CHUNK_SIZE:
+                    resolve(key)
+        except (ValueError, TypeError, UnicodeDecodeError) as e:
+            db.session.rollback()
+            return jsonify({'error': f'Invalid roster: {e}'}), 400
+        
+        resolve('student_id')
+        resolve('email')
+        
+        ordered_ids = sorted(student_ids)
+        enrolled_ids = []
+        for start in range(0, len(ordered_ids), BULK_ENROLL_CHUNK_SIZE):
+            chunk = ordered_ids[start:start + BULK_ENROLL_CHUNK_SIZE]
+            enrolled_ids.extend(enroll_chunk(course_id, chunk, enrolled_at))
+        counts['created'] = len(enrolled_ids)
+        counts['skipped'] = len(student_ids) - len(enrolled_ids)
+        
+        db.session.commit()
+        invalidate_membership(enrolled_ids)
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'{counts["created"]} students enrolled',
+            'counts': counts
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def my_courses_query(current_user):
+    """
+    Build the my-courses statement of a user
+    
+    Students get their enrolled courses, instructors the courses they
+    created; counts come from correlated subqueries on those courses.
+    
+    Returns:
+        tuple: (RowSchema, Select)
+    """
+    if current_user['role'] == 'student':
+        # Get enrolled courses with instructor and lesson count
+        schema = course_schema(
+            instructor_name=func.coalesce(User.full_name, 'Unknown'),
+            enrolled_at=Enrollment.enrolled_at,
+            lesson_count=lesson_count_column()
+        )
+        statement = (
+            select(*schema.columns())
+            .select_from(Course)
+            .join(Enrollment, Enrollment.course_id == Course.id)
+            .outerjoin(User, User.id == Course.instructor_id)
+            .where(Enrollment.student_id == current_user['user_id'])
+            .order_by(Enrollment.enrolled_at, Course.id)
+        )
+        
+    else:  # instructor
+        # Get created courses with lesson and student counts
+        schema = course_schema(
+            instructor_name=literal(current_user.get('full_name', 'You')),
+            lesson_count=lesson_count_column(),
+            student_count=student_count_column()
+        )
+        statement = (
+            select(*schema.columns())
+            .select_from(Course)
+            .where(Course.instructor_id == current_user['user_id'])
+            .order_by(Course.id)
+        )
+    
+    return schema, statement
+
 @bp.route('/my-courses', methods=['GET'])
 @token_required
 def get_my_courses(current_user):
@@ -185,45 +602,15 @@ def get_my_courses(current_user):
     Get courses for current user
     - For students: enrolled courses
     - For instructors: created courses
+    
+    Served by one query per role: counts come from correlated
+    subqueries on the user's courses only, so neither the query
+    count nor the cost grows with the rest of the catalog
     """
     try:
-        if current_user['role'] == 'student':
-            # Get enrolled courses
-            enrollments = Enrollment.query.filter_by(
-                student_id=current_user['user_id']
-            ).all()
-            
-            courses_data = []
-            for enrollment in enrollments:
-                course = Course.query.get(enrollment.course_id)
-                if course:
-                    course_dict = course.to_dict()
-                    
-                    # Add instructor name
-                    instructor = User.query.get(course.instructor_id)
-                    course_dict['instructor_name'] = instructor.full_name if instructor else 'Unknown'
-                    
-                    # Add enrollment date
-                    course_dict['enrolled_at'] = enrollment.enrolled_at.isoformat()
-                    
-                    # Add lesson count
-                    course_dict['lesson_count'] = len(course.lessons)
-                    
-                    courses_data.append(course_dict)
-        
-        else:  # instructor
-            # Get created courses
-            courses = Course.query.filter_by(
-                instructor_id=current_user['user_id']
-            ).all()
-            
-            courses_data = []
-            for course in courses:
-                course_dict = course.to_dict()
-                course_dict['instructor_name'] = current_user.get('full_name', 'You')
-                course_dict['lesson_count'] = len(course.lessons)
-                course_dict['student_count'] = len(course.enrollments)
-                courses_data.append(course_dict)
+        schema, statement = my_courses_query(current_user)
+        
+        courses_data = schema.dump(db.session.execute(statement))
         
         return jsonify({
             'status': 'success',
@@ -233,6 +620,128 @@ def get_my_courses(current_user):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def completion_percent(completed_count, total_lessons):
+    """Percentage of lessons completed, rounded to one decimal"""
+    if not total_lessons:
+        return 0.0
+    return round(100.0 * min(completed_count, total_lessons) / total_lessons, 1)
+
+@bp.route('/<int:course_id>/progress', methods=['GET'])
+@token_required
+@role_required('student')
+def get_course_progress(current_user, course_id):
+    """
+    Get the current student's progress in a course
+    ("X of Y lessons complete"), read from the course_progress rollup
+    """
+    try:
+        course = Course.query.get(course_id)
+        if not course:
+            return jsonify({'error': 'Course not found'}), 404
+        
+        row = (
+            db.session.query(
+                Enrollment.id,
+                CourseProgress.completed_count,
+                CourseProgress.last_activity
+            )
+            .outerjoin(CourseProgress, and_(
+                CourseProgress.student_id == Enrollment.student_id,
+                CourseProgress.course_id == Enrollment.course_id
+            ))
+            .filter(
+                Enrollment.student_id == current_user['user_id'],
+                Enrollment.course_id == course_id
+            )
+            .first()
+        )
+        
+        if row is None:
+            return jsonify({'error': 'You must be enrolled in this course'}), 403
+        
+        _, completed_count, last_activity = row
+        completed_count = completed_count or 0
+        total_lessons = Lesson.query.filter_by(course_id=course_id).count()
+        
+        return jsonify({
+            'status': 'success',
+            'progress': {
+                'course_id': course_id,
+                'completed_lessons': completed_count,
+                'total_lessons': total_lessons,
+                'percent_complete': completion_percent(completed_count, total_lessons),
+                'last_activity': last_activity.isoformat() if last_activity else None
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/<int:course_id>/progress/students', methods=['GET'])
+@token_required
+@role_required('instructor')
+def get_course_progress_dashboard(current_user, course_id):
+    """
+    Get completion for every enrolled student (instructors only, own courses)
+    One row per student from the rollup: O(students), not O(students x lessons)
+    """
+    try:
+        course = Course.query.get(course_id)
+        if not course:
+            return jsonify({'error': 'Course not found'}), 404
+        
+        # Check ownership
+        if course.instructor_id != current_user['user_id']:
+            return jsonify({'error': 'You can only view progress for your own courses'}), 403
+        
+        total_lessons = Lesson.query.filter_by(course_id=course_id).count()
+        
+        rows = (
+            db.session.query(
+                User.id,
+                User.full_name,
+                User.email,
+                func.coalesce(CourseProgress.completed_count, 0),
+                CourseProgress.last_activity
+            )
+            .join(Enrollment, Enrollment.student_id == User.id)
+            .outerjoin(CourseProgress, and_(
+                CourseProgress.student_id == Enrollment.student_id,
+                CourseProgress.course_id == Enrollment.course_id
+            ))
+            .filter(Enrollment.course_id == course_id)
+            .order_by(User.full_name, User.id)
+            .all()
+        )
+        
+        students_data = []
+        for student_id, full_name, email, completed_count, last_activity in rows:
+            students_data.append({
+                'student_id': student_id,
+                'full_name': full_name,
+                'email': email,
+                'completed_lessons': completed_count,
+                'percent_complete': completion_percent(completed_count, total_lessons),
+                'last_activity': last_activity.isoformat() if last_activity else None
+            })
+        
+        completed_all = sum(
+            1 for student in students_data
+            if total_lessons and student['completed_lessons'] >= total_lessons
+        )
+        
+        return jsonify({
+            'status': 'success',
+            'course_id': course_id,
+            'total_lessons': total_lessons,
+            'student_count': len(students_data),
+            'completed_count': completed_all,
+            'students': students_data
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @bp.route('/<int:course_id>', methods=['PUT'])
 @token_required
 @role_required('instructor')
@@ -287,8 +796,10 @@ def delete_course(current_user, course_id):
         if course.instructor_id != current_user['user_id']:
             return jsonify({'error': 'You can only delete your own courses'}), 403
         
+        student_ids = [enrollment.student_id for enrollment in course.enrollments]
         db.session.delete(course)
         db.session.commit()
+        invalidate_membership(student_ids)
         
         return jsonify({
             'status': 'success',
@@ -0,0 +1,63 @@
+"""
+Export Routes
+Streaming NDJSON / CSV downloads of course data for reporting
+"""
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from sqlalchemy import select
+from app import db
+from app.models.course import Course
+from app.utils.auth import token_required, role_required
+from app.utils.export import EXPORTS, EXPORT_FORMATS, generate_export
+
+bp = Blueprint('exports', __name__, url_prefix='/api/exports')
+
+@bp.route('/<name>', methods=['GET'])
+@token_required
+@role_required('instructor')
+def export_table(current_user, name):
+    """
+    Download courses, enrollments, progress or submissions (instructors only)
+    
+    Only rows of the instructor's own courses are exported. The body
+    is streamed while the rows are read, so memory use does not grow
+    with the size of the table.
+    
+    Query parameters:
+        format: 'ndjson' (default) or 'csv'
+        course_id: Limit the export to one of the instructor's courses
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if name not in EXPORTS:
+            return jsonify({'error': f'Unknown export: {name}'}), 404
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f'format must be one of: {", ".join(EXPORT_FORMATS)}'}), 400
+        
+        course_ids = select(Course.id).where(Course.instructor_id == current_user['user_id'])
+        
+        course_id = request.args.get('course_id')
+        if course_id is not None:
+            try:
+                course_id = int(course_id)
+            except ValueError:
+                return jsonify({'error': 'course_id must be an integer'}), 400
+            
+            course = db.session.get(Course, course_id)
+            if not course:
+                return jsonify({'error': 'Course not found'}), 404
+            if course.instructor_id != current_user['user_id']:
+                return jsonify({'error': 'You can only export your own courses'}), 403
+            course_ids = [course_id]
+        
+        mimetype, _ = EXPORT_FORMATS[export_format]
+        chunks = generate_export(name, export_format, course_ids=course_ids)
+        
+        return Response(
+            stream_with_context(chunks),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={name}.{export_format}'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -4,15 +4,45 @@ Lesson creation and viewing
 """
 
 from flask import Blueprint, request, jsonify
+from sqlalchemy import and_, literal, or_, select
+from datetime import datetime, timezone
 from app import db
 from app.models.course import Course
 from app.models.lesson import Lesson
 from app.models.enrollment import Enrollment
 from app.models.progress import Progress
 from app.utils.auth import token_required, role_required
+from app.utils.database import upsert_insert
+from app.utils.progress import refresh_course_progress, discount_lesson_progress
+from app.utils.http_cache import compute_etag, conditional_response
+from app.utils.model_cache import cached_lesson
+from app.utils.membership import is_enrolled
 
 bp = Blueprint('lessons', __name__, url_prefix='/api/lessons')
 
+# most completion events accepted by one sync request
+MAX_SYNC_EVENTS = 500
+
+def parse_completed_at(value, now):
+    """
+    Parse a client completion timestamp (ISO 8601) as naive UTC
+    
+    Missing values mean "now"; timestamps in the future are clamped
+    to now so a skewed client clock cannot win every later sync.
+    """
+    if value is None:
+        return now
+    
+    completed_at = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    if completed_at.tzinfo is not None:
+        completed_at = completed_at.astimezone(timezone.utc).replace(tzinfo=None)
+    
+    return min(completed_at, now)
+
+def parse_timestamp(value):
+    """ISO string from a cached to_dict() -> datetime (None stays None)"""
+    return datetime.fromisoformat(value) if value else None
+
 @bp.route('', methods=['POST'])
 @token_required
 @role_required('instructor')
@@ -60,6 +90,9 @@ def create_lesson(current_user):
         )
         
         db.session.add(new_lesson)
+        
+        # the course outline changed: bump the course version (ETags)
+        course.updated_at = datetime.utcnow()
         db.session.commit()
         
         return jsonify({
@@ -78,48 +111,69 @@ def get_lesson(current_user, lesson_id):
     """
     Get a specific lesson
     Students must be enrolled in the course
+    
+    Lesson and course come from the read-through cache. Supports
+    conditional GET: the ETag covers the lesson and course row versions
+    and the student's completion (Last-Modified only for instructors)
     """
     try:
-        lesson = Lesson.query.get(lesson_id)
+        lesson_entry, course_entry = cached_lesson(lesson_id)
         
-        if not lesson:
+        if not lesson_entry:
             return jsonify({'error': 'Lesson not found'}), 404
         
-        course = Course.query.get(lesson.course_id)
+        lesson = lesson_entry['lesson']
+        course = course_entry['course']
         
         # Check access permissions
         if current_user['role'] == 'student':
             # Check if student is enrolled
-            enrollment = Enrollment.query.filter_by(
-                student_id=current_user['user_id'],
-                course_id=lesson.course_id
-            ).first()
-            
-            if not enrollment:
+            if not is_enrolled(current_user['user_id'], lesson['course_id']):
                 return jsonify({'error': 'You must be enrolled in this course to view lessons'}), 403
-        
+            
         elif current_user['role'] == 'instructor':
             # Check if instructor owns the course
-            if course.instructor_id != current_user['user_id']:
+            if course['instructor_id'] != current_user['user_id']:
                 return jsonify({'error': 'Access denied'}), 403
         
-        lesson_dict = lesson.to_dict()
-        
-        # Add course info
-        lesson_dict['course_title'] = course.title
-        
         # Check if student has completed this lesson
+        progress = None
         if current_user['role'] == 'student':
             progress = Progress.query.filter_by(
                 student_id=current_user['user_id'],
-                lesson_id=lesson.id
+                lesson_id=lesson_id
             ).first()
-            lesson_dict['completed'] = progress.completed if progress else False
         
-        return jsonify({
-            'status': 'success',
-            'lesson': lesson_dict
-        }), 200
+        completed_at = progress.completed_at if progress else None
+        etag = compute_etag('lesson', lesson_id, lesson_entry['version'], course_entry['version'],
+                            current_user['role'], completed_at)
+        
+        # synced completions may carry an earlier completed_at, so students
+        # revalidate with the ETag only
+        last_modified = None
+        if current_user['role'] != 'student':
+            last_modified = max(
+                value for value in (
+                    parse_timestamp(lesson['updated_at']),
+                    parse_timestamp(course['updated_at'])
+                ) if value
+            )
+        
+        def render():
+            lesson_dict = dict(lesson)
+            
+            # Add course info
+            lesson_dict['course_title'] = course['title']
+            
+            if current_user['role'] == 'student':
+                lesson_dict['completed'] = progress.completed if progress else False
+            
+            return jsonify({
+                'status': 'success',
+                'lesson': lesson_dict
+            }), 200
+        
+        return conditional_response(etag, last_modified, render)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -130,45 +184,53 @@ def get_lesson(current_user, lesson_id):
 def mark_lesson_complete(current_user, lesson_id):
     """
     Mark a lesson as completed (students only)
+    
+    Runs as one atomic upsert: the enrollment check is part of the
+    INSERT ... SELECT and repeated submits update the existing row
     """
     try:
-        lesson = Lesson.query.get(lesson_id)
-        
-        if not lesson:
-            return jsonify({'error': 'Lesson not found'}), 404
-        
-        # Check if student is enrolled
-        enrollment = Enrollment.query.filter_by(
-            student_id=current_user['user_id'],
-            course_id=lesson.course_id
-        ).first()
+        student_id = current_user['user_id']
+        
+        # only selects the lesson if the student is enrolled in its course
+        enrolled_lesson = (
+            select(
+                literal(student_id),
+                Lesson.id,
+                literal(True),
+                literal(datetime.utcnow())
+            )
+            .join(Enrollment, and_(
+                Enrollment.course_id == Lesson.course_id,
+                Enrollment.student_id == student_id
+            ))
+            .where(Lesson.id == lesson_id)
+        )
         
-        if not enrollment:
+        statement = upsert_insert(Progress).from_select(
+            ['student_id', 'lesson_id', 'completed', 'completed_at'],
+            enrolled_lesson
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=['student_id', 'lesson_id'],
+            set_={
+                'completed': True,
+                'completed_at': statement.excluded.completed_at
+            }
+        ).returning(*Progress.__table__.c)
+        
+        row = db.session.execute(statement).first()
+        
+        if row is None:
+            db.session.rollback()
+            
+            # nothing inserted: tell apart a missing lesson and no enrollment
+            if not db.session.get(Lesson, lesson_id):
+                return jsonify({'error': 'Lesson not found'}), 404
             return jsonify({'error': 'You must be enrolled in this course'}), 403
         
-        # Check if progress record exists
-        progress = Progress.query.filter_by(
-            student_id=current_user['user_id'],
-            lesson_id=lesson_id
-        ).first()
-        
-        if progress:
-            # Update existing
-            progress.completed = True
-            from datetime import datetime
-            progress.completed_at = datetime.utcnow()
-        else:
-            # Create new
-            from datetime import datetime
-            progress = Progress(
-                student_id=current_user['user_id'],
-                lesson_id=lesson_id,
-                completed=True,
-                completed_at=datetime.utcnow()
-            )
-            db.session.add(progress)
-        
+        refresh_course_progress(student_id, [lesson_id])
         db.session.commit()
+        progress = Progress(**row._asdict())
         
         return jsonify({
             'status': 'success',
@@ -180,6 +242,102 @@ def mark_lesson_complete(current_user, lesson_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/progress/sync', methods=['POST'])
+@token_required
+@role_required('student')
+def sync_progress(current_user):
+    """
+    Record a batch of lesson completions (students only)
+    Used by offline/mobile clients replaying completions on reconnect
+    
+    Expected JSON:
+    {
+        "events": [
+            {"lesson_id": 1, "completed_at": "2026-01-01T10:00:00Z"},
+            {"lesson_id": 2}
+        ]
+    }
+    
+    Enrollment is checked for every lesson in one query and all events
+    are applied in one transaction. When a lesson already has a
+    completion, the later completed_at wins.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        events = data.get('events')
+        
+        if not isinstance(events, list) or not events:
+            return jsonify({'error': 'events is required'}), 400
+        if len(events) > MAX_SYNC_EVENTS:
+            return jsonify({'error': f'At most {MAX_SYNC_EVENTS} events per request'}), 400
+        
+        # keep the latest completion per lesson
+        now = datetime.utcnow()
+        latest = {}
+        try:
+            for event in events:
+                lesson_id = int(event['lesson_id'])
+                completed_at = parse_completed_at(event.get('completed_at'), now)
+                if lesson_id not in latest or completed_at > latest[lesson_id]:
+                    latest[lesson_id] = completed_at
+        except (KeyError, TypeError, ValueError) as e:
+            return jsonify({'error': f'Invalid event: {e}'}), 400
+        
+        student_id = current_user['user_id']
+        
+        # lessons (among the requested ones) in the student's courses
+        allowed = set(db.session.execute(
+            select(Lesson.id)
+            .join(Enrollment, and_(
+                Enrollment.course_id == Lesson.course_id,
+                Enrollment.student_id == student_id
+            ))
+            .where(Lesson.id.in_(list(latest)))
+        ).scalars())
+        
+        rejected = sorted(lesson_id for lesson_id in latest if lesson_id not in allowed)
+        
+        applied = []
+        if allowed:
+            statement = upsert_insert(Progress).values([
+                {
+                    'student_id': student_id,
+                    'lesson_id': lesson_id,
+                    'completed': True,
+                    'completed_at': latest[lesson_id]
+                }
+                for lesson_id in sorted(allowed)
+            ])
+            statement = statement.on_conflict_do_update(
+                index_elements=['student_id', 'lesson_id'],
+                set_={
+                    'completed': True,
+                    'completed_at': statement.excluded.completed_at
+                },
+                # last write wins: never move a completion back in time
+                where=or_(
+                    Progress.completed_at.is_(None),
+                    Progress.completed_at < statement.excluded.completed_at
+                )
+            ).returning(Progress.lesson_id)
+            
+            applied = sorted(db.session.execute(statement).scalars())
+            refresh_course_progress(student_id, applied)
+        
+        db.session.commit()
+        
+        return jsonify({
+            'status': 'success',
+            'message': f'{len(applied)} lessons updated',
+            'applied': applied,
+            'unchanged': sorted(allowed.difference(applied)),
+            'rejected': rejected
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @bp.route('/<int:lesson_id>', methods=['PUT'])
 @token_required
 @role_required('instructor')
@@ -209,6 +367,8 @@ def update_lesson(current_user, lesson_id):
         if 'order_index' in data:
             lesson.order_index = data['order_index']
         
+        # the course outline may have changed: bump the course version (ETags)
+        course.updated_at = datetime.utcnow()
         db.session.commit()
         
         return jsonify({
@@ -240,7 +400,11 @@ def delete_lesson(current_user, lesson_id):
         if course.instructor_id != current_user['user_id']:
             return jsonify({'error': 'You can only delete lessons in your own courses'}), 403
         
+        discount_lesson_progress(lesson)
         db.session.delete(lesson)
+        
+        # the course outline changed: bump the course version (ETags)
+        course.updated_at = datetime.utcnow()
         db.session.commit()
         
         return jsonify({
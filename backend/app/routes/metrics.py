@@ -0,0 +1,37 @@
+"""
+Metrics Routes
+Prometheus scrape endpoint for all workers of the server
+"""
+
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from app.utils.ingest import get_submission_queue
+from app.utils.metrics import add_submission_queue_samples, render
+
+# create blueprint (route group)
+bp = Blueprint('metrics', __name__)
+
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Prometheus metrics endpoint
+    Returns: Request, database, cache and password hashing metrics
+    summed over all workers, in the text exposition format
+    
+    Latency histograms and request counts are labeled by blueprint,
+    route rule and method (and status). With METRICS_TOKEN set the
+    scraper must send 'Authorization: Bearer <METRICS_TOKEN>'.
+    """
+    token = current_app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    
+    collector = current_app.extensions.get('metrics')
+    if collector is None:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    
+    samples = collector.aggregate()
+    if current_app.config['SUBMISSION_INGEST'] == 'queue':
+        add_submission_queue_samples(samples, get_submission_queue().stats())
+    
+    return Response(render(samples), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -4,30 +4,70 @@ Password hashing and JWT token management
 """
 
 import jwt
-import bcrypt
+import hashlib
 from datetime import datetime, timedelta
 from flask import current_app
 from functools import wraps
 from flask import request, jsonify
+from app.utils.cache import LRUCache
+from app.utils.workers import BoundedExecutor
+from app.utils.passwords import PasswordHasherRegistry
+
+def get_password_pool():
+    """
+    Get the password hashing worker pool of the current app
+    
+    bcrypt runs on this pool instead of the request thread, so only
+    PASSWORD_HASH_WORKERS hashes run at once and a login burst beyond
+    PASSWORD_HASH_QUEUE waiting jobs is rejected with PoolBusyError.
+    
+    Returns:
+        BoundedExecutor: Password hashing pool
+    """
+    pool = current_app.extensions.get('password_pool')
+    if pool is None:
+        config = current_app.config
+        pool = BoundedExecutor(
+            max_workers=config['PASSWORD_HASH_WORKERS'],
+            max_queue=config['PASSWORD_HASH_QUEUE'],
+            retry_after=config['PASSWORD_HASH_RETRY_AFTER'],
+            name='bcrypt'
+        )
+        current_app.extensions['password_pool'] = pool
+    return pool
+
+def get_password_hashers():
+    """
+    Get the password hasher registry of the current app
+    
+    Returns:
+        PasswordHasherRegistry: Hashers configured from PASSWORD_HASHER,
+        BCRYPT_ROUNDS and SCRYPT_*
+    """
+    hashers = current_app.extensions.get('password_hashers')
+    if hashers is None:
+        hashers = PasswordHasherRegistry(current_app.config)
+        current_app.extensions['password_hashers'] = hashers
+    return hashers
 
 def hash_password(password):
     """
-    Hash a password using bcrypt
+    Hash a password with the default hasher (on the password worker pool)
     
     Args:
         password (str): Plain text password
         
     Returns:
         str: Hashed password
+        
+    Raises:
+        PoolBusyError: If the hashing queue is full
     """
-    # Generate salt and hash password
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    return get_password_pool().run(get_password_hashers().hash, password)
 
 def verify_password(password, hashed_password):
     """
-    Verify a password against its hash
+    Verify a password against its hash (on the password worker pool)
     
     Args:
         password (str): Plain text password
@@ -35,11 +75,23 @@ def verify_password(password, hashed_password):
         
     Returns:
         bool: True if password matches, False otherwise
+        
+    Raises:
+        PoolBusyError: If the hashing queue is full
     """
-    return bcrypt.checkpw(
-        password.encode('utf-8'), 
-        hashed_password.encode('utf-8')
-    )
+    return get_password_pool().run(get_password_hashers().verify, password, hashed_password)
+
+def password_needs_rehash(hashed_password):
+    """
+    Check whether a stored hash uses an outdated scheme or cost
+    
+    Args:
+        hashed_password (str): Stored hash
+        
+    Returns:
+        bool: True if the hash should be upgraded
+    """
+    return get_password_hashers().needs_rehash(hashed_password)
 
 def generate_token(user_id, role):
     """
@@ -67,27 +119,56 @@ def generate_token(user_id, role):
     
     return token
 
+def get_token_cache():
+    """
+    Get the verified token cache of the current app
+    
+    Returns:
+        LRUCache: Cache of token digest -> decoded payload
+    """
+    cache = current_app.extensions.get('token_cache')
+    if cache is None:
+        cache = LRUCache(maxsize=current_app.config['TOKEN_CACHE_SIZE'])
+        current_app.extensions['token_cache'] = cache
+    return cache
+
 def decode_token(token):
     """
     Decode and verify JWT token
     
+    Tokens that verified successfully are cached (keyed by their
+    SHA-256 digest) until their 'exp' claim, so repeat requests with
+    the same token skip the signature check.
+    
     Args:
         token (str): JWT token
         
     Returns:
         dict: Decoded payload or None if invalid
     """
+    cache = get_token_cache()
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    
+    payload = cache.get(digest)
+    if payload is not None:
+        return dict(payload)
+    
     try:
         payload = jwt.decode(
             token,
             current_app.config['SECRET_KEY'],
             algorithms=['HS256']
         )
-        return payload
     except jwt.ExpiredSignatureError:
         return None  # Token expired
     except jwt.InvalidTokenError:
         return None  # Invalid token
+    
+    # only cache tokens that expire, so revoking by expiry still works
+    if 'exp' in payload:
+        cache.set(digest, payload, expires_at=payload['exp'])
+    
+    return dict(payload)
 
 def token_required(f):
     """
@@ -0,0 +1,332 @@
+"""
+Cache Utilities
+Cache backend interface, bounded in-process LRU cache with expiry,
+a host-wide SQLite cache shared by worker processes and the per-app
+read-through cache
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import threading
+import importlib
+from collections import OrderedDict
+from flask import current_app
+
+class CacheBackend:
+    """
+    Interface for read-through cache backends
+
+    A backend stores JSON-ready values by string key. Shared backends
+    (e.g. a Redis stand-in) can subclass this and be selected with
+    CACHE_BACKEND = 'package.module:ClassName'; they are built with
+    from_config(config).
+    """
+
+    @classmethod
+    def from_config(cls, config):
+        return cls()
+
+    def get(self, key):
+        """Return the cached value or None"""
+        raise NotImplementedError
+
+    def set(self, key, value, expires_at=None):
+        """Store a value until expires_at (Unix time, None = backend default)"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove a key if present"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every entry"""
+        raise NotImplementedError
+
+    def stats(self):
+        """Return a dict with at least hits, misses and hit_ratio"""
+        raise NotImplementedError
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything (CACHE_BACKEND = 'null')"""
+
+    def __init__(self):
+        self.misses = 0
+
+    def get(self, key):
+        self.misses += 1
+        return None
+
+    def set(self, key, value, expires_at=None):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        self.misses = 0
+
+    def stats(self):
+        return {'hits': 0, 'misses': self.misses, 'hit_ratio': 0.0}
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe LRU cache with a maximum size
+
+    Each entry can carry an absolute expiry time (time.time() based),
+    or gets one from the default ttl (seconds); expired entries are
+    dropped when they are looked up.
+
+    Usage:
+        cache = LRUCache(maxsize=1024, ttl=300)
+        cache.set('key', value, expires_at=time.time() + 60)
+        cache.get('key')  # value, or None after expiry
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(maxsize=config['CACHE_MAX_ENTRIES'], ttl=config['CACHE_TTL'])
+
+    def get(self, key):
+        """
+        Look up a key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at=None):
+        """
+        Store a value, evicting the least recently used entry when full
+
+        Args:
+            key: Hashable cache key
+            value: Value to store (None is not cacheable)
+            expires_at (float): Unix time after which the entry is stale
+        """
+        if expires_at is None and self.ttl:
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a key if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: size, maxsize, hits, misses and hit_ratio
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache in a SQLite file, shared by every process on the host
+
+    The prefork workers of one server all read and write the same file,
+    so an invalidation made by the worker that handled a write is seen
+    by the others at once (LRUCache is one cache per process). Values
+    are stored as JSON; entries expire like LRUCache entries and, once
+    more than maxsize are stored, the ones closest to expiry are pruned.
+
+    Keep the file on local (ideally memory backed) storage: it is only
+    a cache, so it is opened without fsync. Servers on several hosts
+    need a network backend (CACHE_BACKEND = 'package.module:Class').
+
+    Usage:
+        cache = SQLiteCache('/dev/shm/lms-cache.db', maxsize=10000, ttl=300)
+    """
+
+    # prune expired and surplus entries every this many sets
+    PRUNE_INTERVAL = 256
+
+    def __init__(self, path, maxsize=10000, ttl=None):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._sets = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=OFF')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)'
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        path = config['CACHE_PATH'] or os.path.join(tempfile.gettempdir(), 'lms-cache.db')
+        return cls(path, maxsize=config['CACHE_MAX_ENTRIES'], ttl=config['CACHE_TTL'])
+
+    def get(self, key):
+        """
+        Look up a key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM cache_entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time())
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value, expires_at=None):
+        """
+        Store a value, pruning expired and surplus entries now and then
+
+        Args:
+            key (str): Cache key
+            value: JSON-ready value to store (None is not cacheable)
+            expires_at (float): Unix time after which the entry is stale
+        """
+        if expires_at is None and self.ttl:
+            expires_at = time.time() + self.ttl
+        data = json.dumps(value)
+
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, data, expires_at)
+            )
+            self._sets += 1
+            if self._sets % self.PRUNE_INTERVAL == 0:
+                self._prune()
+
+    def _prune(self):
+        self._connection.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (time.time(),))
+        self._connection.execute(
+            'DELETE FROM cache_entries WHERE key IN ('
+            'SELECT key FROM cache_entries ORDER BY expires_at LIMIT '
+            'max(0, (SELECT count(*) FROM cache_entries) - ?))',
+            (self.maxsize,)
+        )
+
+    def delete(self, key):
+        """Remove a key if present (for every process)"""
+        with self._lock:
+            self._connection.execute('DELETE FROM cache_entries WHERE key = ?', (key,))
+
+    def clear(self):
+        """Remove every entry and reset this process's counters"""
+        with self._lock:
+            self._connection.execute('DELETE FROM cache_entries')
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get cache statistics
+
+        Returns:
+            dict: size (all processes, flagged by shared), maxsize and
+            this process's hits, misses and hit_ratio
+        """
+        with self._lock:
+            size = self._connection.execute('SELECT count(*) FROM cache_entries').fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'size': size,
+                'shared': True,
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0
+            }
+
+# built-in backends, selected by the CACHE_BACKEND setting
+CACHE_BACKENDS = {
+    'memory': LRUCache,
+    'sqlite': SQLiteCache,
+    'null': NullCache,
+}
+
+def create_cache(config):
+    """
+    Build the read-through cache backend named by CACHE_BACKEND
+
+    Args:
+        config (Config): Flask app config
+
+    Returns:
+        CacheBackend: Configured backend
+    """
+    name = config['CACHE_BACKEND']
+    if name in CACHE_BACKENDS:
+        backend_class = CACHE_BACKENDS[name]
+    elif ':' in name:
+        module_name, class_name = name.split(':', 1)
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+    else:
+        raise ValueError(f'Unknown CACHE_BACKEND "{name}"')
+
+    return backend_class.from_config(config)
+
+def get_cache():
+    """
+    Get the read-through cache of the current app
+
+    Returns:
+        CacheBackend: Cache for serialized courses and lessons
+    """
+    cache = current_app.extensions.get('read_cache')
+    if cache is None:
+        cache = create_cache(current_app.config)
+        current_app.extensions['read_cache'] = cache
+    return cache
@@ -0,0 +1,126 @@
+"""
+Cooperative Database I/O
+Keeps gevent workers serving other requests while a query runs
+"""
+
+import logging
+from sqlalchemy import event
+from app.utils.database import is_sqlite
+
+logger = logging.getLogger(__name__)
+
+def gevent_active():
+    """Check whether gevent has monkey patched this process"""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+class ThreadedCursor:
+    """
+    sqlite3 cursor whose blocking calls run on a native thread pool
+
+    Like aiosqlite does for asyncio: the calling greenlet waits for the
+    result while the worker keeps serving other requests.
+    """
+
+    def __init__(self, cursor, pool):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_pool', pool)
+
+    def execute(self, *args):
+        self._pool.apply(self._cursor.execute, args)
+        return self
+
+    def executemany(self, *args):
+        self._pool.apply(self._cursor.executemany, args)
+        return self
+
+    def fetchone(self):
+        return self._pool.apply(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._pool.apply(self._cursor.fetchmany, args)
+
+    def fetchall(self):
+        return self._pool.apply(self._cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._cursor, name, value)
+
+class ThreadedConnection:
+    """sqlite3 connection handing out ThreadedCursors"""
+
+    def __init__(self, connection, pool):
+        object.__setattr__(self, '_connection', connection)
+        object.__setattr__(self, '_pool', pool)
+
+    def cursor(self, *args):
+        return ThreadedCursor(self._connection.cursor(*args), self._pool)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def commit(self):
+        self._pool.apply(self._connection.commit)
+
+    def rollback(self):
+        self._pool.apply(self._connection.rollback)
+
+    def close(self):
+        self._pool.apply(self._connection.close)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection, name, value)
+
+def register_cooperative_io(engine, config):
+    """
+    Make the engine's database waits yield to other greenlets
+
+    Only acts in gevent workers (GUNICORN_WORKER_CLASS=gevent). For
+    PostgreSQL the psycopg2 wait callback of psycogreen is installed
+    when the package is available, so network round trips yield.
+
+    SQLite calls block in C. With SQLITE_THREADED_IO its connections
+    run their queries on a pool of native threads sized like the
+    connection pool; this costs throughput on fast indexed reads (the
+    GIL hand-offs), but keeps long scans and write lock waits from
+    stalling the whole worker.
+
+    Args:
+        engine (Engine): SQLAlchemy engine
+        config (Config): Flask app config
+    """
+    if not gevent_active() or not config['DB_COOPERATIVE_IO']:
+        return
+
+    if is_sqlite(str(engine.url)):
+        if not config['SQLITE_THREADED_IO']:
+            return
+
+        from gevent.threadpool import ThreadPool
+        pool = ThreadPool(config['DB_POOL_SIZE'] + config['DB_MAX_OVERFLOW'])
+
+        @event.listens_for(engine, 'do_connect')
+        def connect_threaded(dialect, connection_record, cargs, cparams):
+            # the connection is used from the pool's threads
+            cparams['check_same_thread'] = False
+            return ThreadedConnection(dialect.loaded_dbapi.connect(*cargs, **cparams), pool)
+
+    elif engine.dialect.driver == 'psycopg2':
+        try:
+            from psycogreen.gevent import patch_psycopg
+        except ImportError:
+            logger.warning('psycogreen is not installed, PostgreSQL queries block the gevent worker')
+            return
+        patch_psycopg()
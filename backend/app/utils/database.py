@@ -0,0 +1,179 @@
+"""
+Database Engine Utilities
+Connection pool options and SQLite connection tuning
+"""
+
+import time
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+SQLITE_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# migration matching the schema db.create_all() used to build
+BASELINE_REVISION = '0001_initial_schema'
+
+def is_sqlite(uri):
+    """Check whether a database URI points at SQLite"""
+    return make_url(uri).get_backend_name() == 'sqlite'
+
+def is_sqlite_memory(uri):
+    """Check whether a database URI is an in-memory SQLite database"""
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+class TimedQueuePool(QueuePool):
+    """
+    QueuePool reporting how long each checkout waited for a connection
+
+    on_checkout_wait(seconds) is called after every checkout (set by
+    app/utils/metrics.py). The wait covers an exhausted pool (all
+    pool_size + max_overflow connections in use) and opening new
+    connections.
+    """
+
+    on_checkout_wait = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        record = super()._do_get()
+        if self.on_checkout_wait is not None:
+            self.on_checkout_wait(time.perf_counter() - started)
+        return record
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.on_checkout_wait = self.on_checkout_wait
+        return pool
+
+def engine_options(config):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS from the app config
+
+    Args:
+        config (Config): Flask app config
+
+    Returns:
+        dict: Keyword arguments for create_engine
+    """
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    # in-memory SQLite uses a single static connection, no pool to size
+    if is_sqlite_memory(uri):
+        return options
+
+    options.setdefault('poolclass', TimedQueuePool)
+    options.setdefault('pool_size', config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', config['DB_POOL_TIMEOUT'])
+    options.setdefault('pool_recycle', config['DB_POOL_RECYCLE'])
+    options.setdefault('pool_pre_ping', config['DB_POOL_PRE_PING'])
+
+    if is_sqlite(uri):
+        # let the driver wait for the write lock instead of failing at once
+        connect_args = dict(options.get('connect_args') or {})
+        connect_args.setdefault('timeout', config['SQLITE_BUSY_TIMEOUT_MS'] / 1000)
+        options['connect_args'] = connect_args
+
+    return options
+
+def register_sqlite_pragmas(engine, config):
+    """
+    Apply the SQLite tuning PRAGMAs to every new connection
+
+    WAL lets readers keep going while a writer commits, and
+    synchronous=NORMAL is safe in WAL mode while syncing far less often.
+
+    Args:
+        engine (Engine): SQLAlchemy engine
+        config (Config): Flask app config
+    """
+    uri = str(engine.url)
+    if not is_sqlite(uri):
+        return
+
+    synchronous = config['SQLITE_SYNCHRONOUS'].upper()
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f'SQLITE_SYNCHRONOUS must be one of {", ".join(SQLITE_SYNCHRONOUS_MODES)}')
+
+    use_wal = config['SQLITE_WAL'] and not is_sqlite_memory(uri)
+    busy_timeout = int(config['SQLITE_BUSY_TIMEOUT_MS'])
+    mmap_size = int(config['SQLITE_MMAP_SIZE'])
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if use_wal:
+            cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute(f'PRAGMA synchronous={synchronous}')
+        cursor.execute(f'PRAGMA busy_timeout={busy_timeout}')
+        cursor.execute(f'PRAGMA mmap_size={mmap_size}')
+        cursor.close()
+
+def upgrade_database():
+    """
+    Apply pending schema migrations (must run inside an app context)
+
+    Databases created by db.create_all() before migrations existed have
+    the tables but no alembic_version table; they are stamped at the
+    baseline revision first so only the newer migrations run.
+
+    migrations/env.py leaves the logging configuration alone on this
+    path (alembic.ini would reset the root logger).
+    """
+    from flask import g
+    from flask_migrate import stamp, upgrade
+    from app import db
+
+    g.migrating_from_app = True
+    try:
+        tables = inspect(db.engine).get_table_names()
+        if 'users' in tables and 'alembic_version' not in tables:
+            stamp(revision=BASELINE_REVISION)
+
+        upgrade()
+    finally:
+        g.pop('migrating_from_app', None)
+
+def insert_ignore(model, conflict_columns):
+    """
+    Build an INSERT that silently skips rows violating a unique key
+
+    Uses ON CONFLICT DO NOTHING, which (like RETURNING) both supported
+    databases have: SQLite 3.35+ and PostgreSQL.
+
+    Args:
+        model: Mapped model class to insert into
+        conflict_columns (list): Column names of the unique key
+
+    Returns:
+        Insert: Dialect specific insert statement
+    """
+    return upsert_insert(model).on_conflict_do_nothing(index_elements=conflict_columns)
+
+def upsert_insert(model):
+    """
+    Build a dialect specific INSERT supporting ON CONFLICT clauses
+
+    Lesson completion, progress sync, the progress rollup and every
+    insert_ignore() depend on it, so SQLite and PostgreSQL are the
+    databases the app runs on.
+
+    Args:
+        model: Mapped model class to insert into
+
+    Returns:
+        Insert: SQLite or PostgreSQL insert statement
+    """
+    from app import db
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f'{dialect} is not supported, the app runs on SQLite or PostgreSQL')
+
+    return insert(model)
@@ -0,0 +1,182 @@
+"""
+Export Utilities
+Streaming NDJSON / CSV dumps of whole tables with constant memory
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from flask import current_app
+from sqlalchemy import select
+from app import db
+from app.models.course import Course
+from app.models.lesson import Lesson
+from app.models.enrollment import Enrollment
+from app.models.progress import Progress
+from app.models.assignment import Assignment
+from app.models.submission import Submission
+from app.utils.serializers import RowSchema
+
+class Export:
+    """
+    One exportable table
+
+    Args:
+        schema (RowSchema): Exported fields
+        course_column: Column holding the course a row belongs to
+        joins (list): (target, onclause) pairs needed for course_column
+    """
+
+    def __init__(self, schema, course_column, joins=()):
+        self.schema = schema
+        self.course_column = course_column
+        self.joins = list(joins)
+
+    def statement(self, course_ids=None):
+        """
+        Build the export select, ordered by primary key
+
+        Args:
+            course_ids: Collection or subquery of course IDs to limit
+                        the export to (None = every row)
+        """
+        statement = select(*self.schema.columns())
+        for target, onclause in self.joins:
+            statement = statement.join(target, onclause)
+        if course_ids is not None:
+            statement = statement.where(self.course_column.in_(course_ids))
+        return statement.order_by(self.schema.fields['id'])
+
+# exportable tables by name
+EXPORTS = {
+    'courses': Export(
+        RowSchema(
+            id=Course.id,
+            title=Course.title,
+            description=Course.description,
+            instructor_id=Course.instructor_id,
+            created_at=Course.created_at,
+            updated_at=Course.updated_at
+        ),
+        Course.id
+    ),
+    'enrollments': Export(
+        RowSchema(
+            id=Enrollment.id,
+            student_id=Enrollment.student_id,
+            course_id=Enrollment.course_id,
+            enrolled_at=Enrollment.enrolled_at
+        ),
+        Enrollment.course_id
+    ),
+    'progress': Export(
+        RowSchema(
+            id=Progress.id,
+            student_id=Progress.student_id,
+            lesson_id=Progress.lesson_id,
+            course_id=Lesson.course_id,
+            completed=Progress.completed,
+            completed_at=Progress.completed_at
+        ),
+        Lesson.course_id,
+        joins=[(Lesson, Lesson.id == Progress.lesson_id)]
+    ),
+    'submissions': Export(
+        RowSchema(
+            id=Submission.id,
+            assignment_id=Submission.assignment_id,
+            course_id=Assignment.course_id,
+            student_id=Submission.student_id,
+            content=Submission.content,
+            submitted_at=Submission.submitted_at,
+            grade=Submission.grade
+        ),
+        Assignment.course_id,
+        joins=[(Assignment, Assignment.id == Submission.assignment_id)]
+    ),
+}
+
+def iter_export_batches(name, course_ids=None, batch_size=None):
+    """
+    Stream the rows of an export in batches
+
+    The statement runs with yield_per, so the driver streams rows
+    (a server-side cursor on PostgreSQL) and only one batch of plain
+    rows is held in memory at a time; no ORM objects are created.
+
+    Args:
+        name (str): Key of EXPORTS
+        course_ids: Optional course ID filter (see Export.statement)
+        batch_size (int): Rows per batch (default EXPORT_BATCH_SIZE)
+
+    Yields:
+        list: Rows of up to batch_size entries
+    """
+    batch_size = batch_size or current_app.config['EXPORT_BATCH_SIZE']
+    statement = EXPORTS[name].statement(course_ids).execution_options(yield_per=batch_size)
+    result = db.session.execute(statement)
+    try:
+        for batch in result.partitions():
+            yield batch
+    finally:
+        result.close()
+
+def ndjson_chunks(batches, names):
+    """Encode batches as newline delimited JSON, one chunk per batch"""
+    dumps = current_app.json.dumps
+    for batch in batches:
+        yield ''.join(dumps(row._asdict()) + '\n' for row in batch)
+
+def _csv_value(value):
+    # match the ISO 8601 text and true/false of the JSON exports
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return value
+
+def csv_chunks(batches, names):
+    """Encode batches as CSV with a header row, one chunk per batch"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(names)
+    for batch in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+# output formats: name -> (mimetype, encoder)
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_chunks),
+    'csv': ('text/csv', csv_chunks),
+}
+
+def generate_export(name, export_format='ndjson', course_ids=None, batch_size=None):
+    """
+    Stream an export as text chunks
+
+    Args:
+        name (str): Key of EXPORTS
+        export_format (str): Key of EXPORT_FORMATS
+        course_ids: Optional course ID filter
+        batch_size (int): Rows fetched per round trip
+
+    Returns:
+        generator: str chunks of the encoded export
+
+    Raises:
+        ValueError: If the table or format is unknown
+    """
+    if name not in EXPORTS:
+        raise ValueError(f'Unknown export "{name}", expected one of: {", ".join(EXPORTS)}')
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f'Unknown format "{export_format}", expected one of: {", ".join(EXPORT_FORMATS)}')
+
+    _, encode = EXPORT_FORMATS[export_format]
+    batches = iter_export_batches(name, course_ids, batch_size)
+    return encode(batches, EXPORTS[name].schema.names)
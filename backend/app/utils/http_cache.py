@@ -0,0 +1,72 @@
+"""
+HTTP Caching Utilities
+ETag / Last-Modified headers and conditional GET (304) handling
+"""
+
+import hashlib
+from datetime import timezone
+from flask import current_app, make_response, request
+
+def compute_etag(*parts):
+    """
+    Build a strong entity tag from the values a response depends on
+
+    Args:
+        *parts: Row ids, versions, flags, ... (anything with a stable repr)
+
+    Returns:
+        str: Unquoted entity tag
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+def as_http_date(value):
+    """Naive UTC datetime -> aware datetime at HTTP (second) precision"""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc, microsecond=0)
+
+def is_not_modified(etag, last_modified=None):
+    """
+    Check the request's If-None-Match / If-Modified-Since headers
+
+    If-None-Match takes precedence when both are sent (RFC 9110).
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+
+    if last_modified is not None and request.if_modified_since is not None:
+        return as_http_date(last_modified) <= request.if_modified_since
+
+    return False
+
+def conditional_response(etag, last_modified, render):
+    """
+    Answer a GET with 304 when the client copy is current, otherwise
+    with render()'s response; both carry the validators
+
+    The per-user responses are only cacheable privately and must be
+    revalidated, and they vary with the Authorization header.
+
+    Args:
+        etag (str): Entity tag from compute_etag
+        last_modified (datetime): Naive UTC modification time (or None)
+        render (callable): Builds the (body, status) of a full response
+
+    Returns:
+        Response: Flask response
+    """
+    if is_not_modified(etag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        body, status = render()
+        response = make_response(body, status)
+        if status != 200:
+            return response
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = as_http_date(last_modified)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Authorization')
+
+    return response
@@ -0,0 +1,379 @@
+"""
+Submission Ingestion Queue
+Append-only local queue that absorbs deadline surges of submissions
+and drains them into the submissions table in batches
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import and_, select
+from app import db
+from app.models.assignment import Assignment
+from app.models.enrollment import Enrollment
+from app.models.submission import Submission
+from app.utils.database import insert_ignore
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_submissions (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    receipt_id TEXT NOT NULL UNIQUE,
+    assignment_id INTEGER NOT NULL,
+    student_id INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    received_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    claimed_by TEXT,
+    claimed_at REAL,
+    submission_id INTEGER,
+    error TEXT,
+    processed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_pending_submissions_status_seq
+    ON pending_submissions (status, seq);
+"""
+
+class SubmissionQueue:
+    """
+    Durable FIFO of received submissions in its own SQLite file
+
+    The queue lives outside the main database, so accepting a
+    submission never waits for the main database's write lock. Rows
+    move from 'queued' to 'claimed' (by one drainer) and end up
+    'stored' (with the submission ID) or 'rejected' (with the reason).
+
+    Usage:
+        queue = SubmissionQueue('/var/lib/lms/submission_queue.db')
+        receipt = queue.enqueue(assignment_id, student_id, content)
+        queue.receipt(receipt['receipt_id'])
+    """
+
+    def __init__(self, path, claim_timeout=60):
+        self.path = path
+        self.claim_timeout = claim_timeout
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.row_factory = sqlite3.Row
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute('PRAGMA busy_timeout=5000')
+        self._connection.executescript(QUEUE_SCHEMA)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config['SUBMISSION_QUEUE_PATH'], claim_timeout=config['SUBMISSION_CLAIM_TIMEOUT'])
+
+    def enqueue(self, assignment_id, student_id, content):
+        """
+        Append a submission and return its receipt
+
+        The server-side receipt time becomes the submission time, so
+        requests received before the deadline are on time however long
+        the queue takes to drain.
+
+        Returns:
+            dict: receipt_id, status and received_at
+        """
+        receipt_id = uuid.uuid4().hex
+        received_at = datetime.utcnow()
+        with self._lock:
+            self._connection.execute(
+                'INSERT INTO pending_submissions (receipt_id, assignment_id, student_id, content, received_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (receipt_id, assignment_id, student_id, content, received_at.isoformat())
+            )
+        return {'receipt_id': receipt_id, 'status': 'queued', 'received_at': received_at.isoformat()}
+
+    def receipt(self, receipt_id):
+        """
+        Look up a receipt
+
+        Returns:
+            dict: Receipt fields, or None if unknown
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT receipt_id, assignment_id, student_id, status, received_at, '
+                'submission_id, error, processed_at FROM pending_submissions WHERE receipt_id = ?',
+                (receipt_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        receipt = dict(row)
+        if receipt['status'] == 'claimed':
+            receipt['status'] = 'queued'  # still being processed
+        return receipt
+
+    def claim(self, limit):
+        """
+        Claim the oldest queued rows for one drain pass
+
+        Rows claimed by a drainer that did not finish within
+        claim_timeout seconds are handed out again.
+
+        Returns:
+            tuple: (claim token, list of row dicts in arrival order)
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            connection = self._connection
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.execute(
+                    "UPDATE pending_submissions SET status = 'queued', claimed_by = NULL "
+                    "WHERE status = 'claimed' AND claimed_at < ?",
+                    (now - self.claim_timeout,)
+                )
+                connection.execute(
+                    "UPDATE pending_submissions SET status = 'claimed', claimed_by = ?, claimed_at = ? "
+                    "WHERE seq IN (SELECT seq FROM pending_submissions WHERE status = 'queued' "
+                    "ORDER BY seq LIMIT ?)",
+                    (token, now, limit)
+                )
+                rows = connection.execute(
+                    'SELECT seq, receipt_id, assignment_id, student_id, content, received_at '
+                    'FROM pending_submissions WHERE claimed_by = ? ORDER BY seq',
+                    (token,)
+                ).fetchall()
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+        return token, [dict(row) for row in rows]
+
+    def complete(self, token, results):
+        """
+        Record the outcome of a claimed batch
+
+        Args:
+            token (str): Claim token from claim()
+            results (list): (seq, status, submission_id, error) tuples
+        """
+        processed_at = datetime.utcnow().isoformat()
+        with self._lock:
+            connection = self._connection
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.executemany(
+                    'UPDATE pending_submissions SET status = ?, submission_id = ?, error = ?, processed_at = ? '
+                    'WHERE seq = ? AND claimed_by = ?',
+                    [
+                        (status, submission_id, error, processed_at, seq, token)
+                        for seq, status, submission_id, error in results
+                    ]
+                )
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+    def release(self, token):
+        """Put a claimed batch back in the queue (e.g. after a failed drain)"""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE pending_submissions SET status = 'queued', claimed_by = NULL WHERE claimed_by = ?",
+                (token,)
+            )
+
+    def stats(self):
+        """
+        Get queue statistics
+
+        Returns:
+            dict: Row counts per status and age of the oldest queued row
+        """
+        with self._lock:
+            counts = dict(self._connection.execute(
+                'SELECT status, count(*) FROM pending_submissions GROUP BY status'
+            ).fetchall())
+            oldest = self._connection.execute(
+                "SELECT min(received_at) FROM pending_submissions WHERE status IN ('queued', 'claimed')"
+            ).fetchone()[0]
+
+        lag = (datetime.utcnow() - datetime.fromisoformat(oldest)).total_seconds() if oldest else 0.0
+        return {
+            'queued': counts.get('queued', 0) + counts.get('claimed', 0),
+            'stored': counts.get('stored', 0),
+            'rejected': counts.get('rejected', 0),
+            'oldest_queued_seconds': lag
+        }
+
+def get_submission_queue():
+    """
+    Get the submission queue of the current app
+
+    Returns:
+        SubmissionQueue: Queue at SUBMISSION_QUEUE_PATH
+    """
+    queue = current_app.extensions.get('submission_queue')
+    if queue is None:
+        queue = SubmissionQueue.from_config(current_app.config)
+        current_app.extensions['submission_queue'] = queue
+    return queue
+
+def drain_submissions(queue, batch_size):
+    """
+    Move one batch from the queue into the submissions table
+
+    The batch is inserted in a single transaction. Entries whose
+    assignment was deleted or whose student is no longer enrolled
+    (checked with one query) are rejected instead of stored.
+    Must run inside an app context.
+
+    Delivery is at least once: a batch committed but not completed
+    (crash, failed complete, claim timed out) is drained again. Each
+    submission keeps its receipt ID in a unique column, so the second
+    insert is skipped and the stored submission IDs are read back.
+
+    Returns:
+        int: Number of queue rows processed (0 when the queue is empty)
+    """
+    token, rows = queue.claim(batch_size)
+    if not rows:
+        return 0
+
+    try:
+        pairs = {(row['assignment_id'], row['student_id']) for row in rows}
+        allowed = set(db.session.execute(
+            select(Assignment.id, Enrollment.student_id)
+            .join(Enrollment, and_(
+                Enrollment.course_id == Assignment.course_id,
+                Enrollment.student_id.in_([student_id for _, student_id in pairs])
+            ))
+            .where(Assignment.id.in_([assignment_id for assignment_id, _ in pairs]))
+        ).tuples())
+
+        stored = []
+        results = []
+        for row in rows:
+            if (row['assignment_id'], row['student_id']) not in allowed:
+                results.append((row['seq'], 'rejected', None, 'Assignment not found or student not enrolled'))
+                continue
+            stored.append(row)
+
+        submission_ids = {}
+        if stored:
+            db.session.execute(insert_ignore(Submission, ['receipt_id']), [
+                {
+                    'assignment_id': row['assignment_id'],
+                    'student_id': row['student_id'],
+                    'content': row['content'],
+                    'submitted_at': datetime.fromisoformat(row['received_at']),
+                    'receipt_id': row['receipt_id']
+                }
+                for row in stored
+            ])
+            submission_ids = dict(db.session.execute(
+                select(Submission.receipt_id, Submission.id)
+                .where(Submission.receipt_id.in_([row['receipt_id'] for row in stored]))
+            ).all())
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        queue.release(token)
+        raise
+
+    results.extend((row['seq'], 'stored', submission_ids[row['receipt_id']], None) for row in stored)
+    queue.complete(token, results)
+    return len(rows)
+
+class SubmissionDrainWorker:
+    """
+    Background thread draining the submission queue
+
+    Wakes up every interval seconds, or right away when wake() is
+    called after an enqueue, and drains batches until the queue is
+    empty. Each process (e.g. gunicorn worker) can run one; claims
+    keep them from processing the same rows.
+    """
+
+    def __init__(self, app, batch_size=200, interval=0.5):
+        self.app = app
+        self.batch_size = batch_size
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, app):
+        return cls(
+            app,
+            batch_size=app.config['SUBMISSION_DRAIN_BATCH'],
+            interval=app.config['SUBMISSION_DRAIN_INTERVAL_MS'] / 1000
+        )
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='submission-drain', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self.app.app_context():
+                queue = get_submission_queue()
+                try:
+                    while not self._stop.is_set() and drain_submissions(queue, self.batch_size):
+                        pass
+                except Exception:
+                    logger.exception('Draining the submission queue failed')
+                finally:
+                    db.session.remove()
+
+def start_drain_worker(app):
+    """
+    Start the background drain thread of an app (once)
+
+    Returns:
+        SubmissionDrainWorker: Running worker
+    """
+    worker = app.extensions.get('submission_drain_worker')
+    if worker is None:
+        worker = SubmissionDrainWorker.from_config(app).start()
+        app.extensions['submission_drain_worker'] = worker
+    return worker
+
+def autostart_drain_worker(app):
+    """
+    Start the drain thread of a server process when queued ingestion
+    is drained in-process, so rows left queued by a crash or restart
+    are stored without waiting for the next enqueue
+
+    Called once the process is ready to serve (gunicorn post_worker_init,
+    run.py); CLI commands never start it.
+    """
+    if app.config['SUBMISSION_INGEST'] == 'queue' and app.config['SUBMISSION_QUEUE_WORKER']:
+        start_drain_worker(app)
+
+def wake_drain_worker():
+    """
+    Ask the current app's drain thread to run now
+
+    The thread is started on first use if autostart_drain_worker did
+    not already, so each (forked) server process gets its own. Without
+    SUBMISSION_QUEUE_WORKER the queue is drained by
+    'flask drain-submissions' instead.
+    """
+    if current_app.config['SUBMISSION_QUEUE_WORKER']:
+        start_drain_worker(current_app._get_current_object()).wake()
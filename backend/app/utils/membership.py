@@ -0,0 +1,81 @@
+"""
+Enrollment Membership Utilities
+Per-student set of enrolled course IDs, cached for authorization checks
+"""
+
+from flask import g
+from sqlalchemy import select
+from app import db
+from app.models.enrollment import Enrollment
+from app.utils.cache import get_cache
+
+def membership_key(student_id):
+    return f'enrollments:{student_id}'
+
+def enrolled_course_ids(student_id):
+    """
+    Get the IDs of the courses a student is enrolled in
+
+    Loaded once per request (kept on flask.g) and shared across
+    requests through the read cache.
+
+    Args:
+        student_id (int): Student user ID
+
+    Returns:
+        frozenset: Enrolled course IDs
+    """
+    memo = g.setdefault('enrolled_course_ids', {})
+    if student_id in memo:
+        return memo[student_id]
+
+    cache = get_cache()
+    course_ids = cache.get(membership_key(student_id))
+
+    if course_ids is None:
+        course_ids = list(db.session.execute(
+            select(Enrollment.course_id).where(Enrollment.student_id == student_id)
+        ).scalars())
+        cache.set(membership_key(student_id), course_ids)
+
+    memo[student_id] = frozenset(course_ids)
+    return memo[student_id]
+
+def is_enrolled(student_id, course_id):
+    """
+    Check whether a student is enrolled in a course
+
+    Positive answers come from the cached set. A course missing from it
+    is confirmed with one indexed lookup (once per request): the set may
+    have been loaded before an enrollment committed and stored after
+    invalidate_membership dropped it. When the lookup finds the
+    enrollment, the stale set is dropped.
+    """
+    if course_id in enrolled_course_ids(student_id):
+        return True
+
+    confirmed = g.setdefault('membership_confirmed', {})
+    key = (student_id, course_id)
+    if key not in confirmed:
+        confirmed[key] = db.session.execute(
+            select(Enrollment.id).where(
+                Enrollment.student_id == student_id,
+                Enrollment.course_id == course_id
+            )
+        ).first() is not None
+        if confirmed[key]:
+            invalidate_membership([student_id])
+    return confirmed[key]
+
+def invalidate_membership(student_ids):
+    """
+    Drop cached membership sets (call after the enrollment change is committed)
+
+    Args:
+        student_ids (iterable): Students whose enrollments changed
+    """
+    cache = get_cache()
+    memo = g.get('enrolled_course_ids', {})
+    for student_id in student_ids:
+        cache.delete(membership_key(student_id))
+        memo.pop(student_id, None)
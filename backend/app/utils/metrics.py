@@ -0,0 +1,472 @@
+"""
+Prometheus Metrics
+Per-worker request, database, cache and password pool metrics,
+shared between prefork workers and rendered in the text format
+"""
+
+import atexit
+import bisect
+import fcntl
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from flask import g, request
+from app.utils.cooperative import gevent_active
+from app.utils.database import TimedQueuePool
+from app.utils.profiling import current_profile
+
+logger = logging.getLogger(__name__)
+
+# request latency buckets (seconds)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# connection pool checkout wait buckets (seconds)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# name: (type, help text)
+FAMILIES = {
+    'lms_http_requests_total': ('counter', 'HTTP requests by route, method and status'),
+    'lms_http_request_duration_seconds': ('histogram', 'Time to build the response by route and method'),
+    'lms_http_requests_in_flight': ('gauge', 'Requests being served'),
+    'lms_db_queries_total': ('counter', 'SQL statements run by requests by route'),
+    'lms_db_query_seconds_total': ('counter', 'Time spent in SQL statements by requests by route'),
+    'lms_db_pool_checkout_wait_seconds': ('histogram', 'Time waited for a pooled database connection'),
+    'lms_db_pool_connections_in_use': ('gauge', 'Database connections checked out of the pool'),
+    'lms_cache_hits_total': ('counter', 'Cache lookups that found an entry'),
+    'lms_cache_misses_total': ('counter', 'Cache lookups that found nothing'),
+    'lms_cache_hit_ratio': ('gauge', 'Cache hits over lookups since the workers started'),
+    'lms_cache_entries': ('gauge', 'Entries held by the caches'),
+    'lms_password_hash_queue_depth': ('gauge', 'Password hashes waiting for a hashing thread'),
+    'lms_password_hash_pending': ('gauge', 'Password hashes queued or running'),
+    'lms_password_hash_rejected_total': ('counter', 'Password hashes refused because the queue was full'),
+    'lms_submission_queue_depth': ('gauge', 'Submissions waiting in the ingestion queue'),
+    'lms_submission_queue_oldest_seconds': ('gauge', 'Age of the oldest queued submission'),
+}
+
+HISTOGRAM_BUCKETS = {
+    'lms_http_request_duration_seconds': REQUEST_BUCKETS,
+    'lms_db_pool_checkout_wait_seconds': POOL_WAIT_BUCKETS,
+}
+
+# snapshot file holding the counters of workers that exited
+ARCHIVE = 'archive'
+
+# lock file serializing archive folds against aggregation
+LOCK_FILE = 'fold.lock'
+
+def new_histogram(buckets):
+    """Count per bucket (the last one is +Inf), followed by the sum"""
+    return [0] * (len(buckets) + 1) + [0.0]
+
+def observe(histogram, buckets, value):
+    histogram[bisect.bisect_left(buckets, value)] += 1
+    histogram[-1] += value
+
+def native_thread_ident():
+    """
+    Get the function identifying the OS thread running the caller
+
+    Under gevent threading.get_ident names the greenlet; the original
+    one is used, so all greenlets of a worker share one shard (they
+    never preempt each other in the middle of an update).
+    """
+    if gevent_active():
+        from gevent.monkey import get_original
+        return get_original('threading', 'get_ident')
+    return threading.get_ident
+
+class MetricsShard:
+    """
+    Metrics updated by one thread only
+
+    Each server thread writes its own shard, so counting needs no lock;
+    readers sum all shards and may see an update a moment late.
+    """
+
+    def __init__(self):
+        self.requests = {}     # (blueprint, route, method, status) -> count
+        self.durations = {}    # (blueprint, route, method) -> histogram
+        self.queries = {}      # (blueprint, route) -> [statements, seconds]
+        self.pool_wait = new_histogram(POOL_WAIT_BUCKETS)
+        self.in_flight = 0
+
+def add_sample(samples, name, labels, value):
+    """
+    Add a value to a sample (histograms add bucket by bucket)
+
+    Args:
+        samples (dict): name -> {labels: value}
+        name (str): Metric family name
+        labels (tuple): (label, value) pairs
+        value: Number, or histogram list
+    """
+    family = samples.setdefault(name, {})
+    current = family.get(labels)
+    if current is None:
+        family[labels] = list(value) if isinstance(value, list) else value
+    elif isinstance(value, list):
+        for index, count in enumerate(value):
+            current[index] += count
+    else:
+        family[labels] = current + value
+
+def merge(samples, other, gauges=True):
+    """Add all samples of other into samples (gauges only if asked)"""
+    for name, family in other.items():
+        if not gauges and FAMILIES[name][0] == 'gauge':
+            continue
+        for labels, value in family.items():
+            add_sample(samples, name, labels, value)
+
+def dump_samples(samples):
+    return {
+        name: [[list(labels), value] for labels, value in family.items()]
+        for name, family in samples.items()
+    }
+
+def load_samples(data):
+    return {
+        name: {tuple(tuple(pair) for pair in labels): value for labels, value in family}
+        for name, family in data.items()
+        if name in FAMILIES
+    }
+
+def read_snapshot(path):
+    """
+    Read a snapshot file
+
+    Returns:
+        dict: Samples, or None if the file is gone or unreadable
+    """
+    try:
+        with open(path) as snapshot_file:
+            return load_samples(json.load(snapshot_file))
+    except (OSError, ValueError):
+        return None
+
+def write_snapshot(path, samples):
+    """Replace a snapshot file atomically (readers never see half a file)"""
+    temporary = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w') as snapshot_file:
+        json.dump(dump_samples(samples), snapshot_file)
+    os.replace(temporary, path)
+
+def process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+@contextmanager
+def directory_lock(directory, exclusive):
+    """
+    Hold the lock file of a snapshot directory
+
+    Folding a worker into the archive takes it exclusively and
+    aggregating takes it shared, so no reader ever counts a worker
+    both in its own snapshot and in the archive.
+    """
+    with open(os.path.join(directory, LOCK_FILE), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def mark_process_dead(directory, pid):
+    """
+    Fold the counters of an exited worker into the archive snapshot
+
+    Counters and histograms keep counting after a worker is recycled;
+    its gauges are dropped. Call from the gunicorn master only
+    (child_exit hook), so the archive has a single writer.
+    """
+    path = os.path.join(directory, f'{pid}.json')
+    with directory_lock(directory, exclusive=True):
+        samples = read_snapshot(path)
+        if samples is None:
+            return
+
+        archive_path = os.path.join(directory, f'{ARCHIVE}.json')
+        archive = read_snapshot(archive_path) or {}
+        merge(archive, samples, gauges=False)
+        write_snapshot(archive_path, archive)
+        os.remove(path)
+
+class RequestMetrics:
+    """
+    Metrics collector of one worker process
+
+    Requests update the calling thread's MetricsShard. With a directory
+    (METRICS_DIR) a background thread writes a snapshot of the worker's
+    metrics to <directory>/<pid>.json every flush_interval seconds (and
+    once more when it exits), and aggregate() adds up the snapshots of
+    all workers: counters of every worker that ever ran, gauges of the
+    live ones.
+    """
+
+    def __init__(self, app, engine, directory=None, flush_interval=1.0):
+        self.app = app
+        self.engine = engine
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._ident = native_thread_ident()
+        self._shards = {}
+        self._flusher_pid = None
+        self._flusher_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, app, engine):
+        return cls(
+            app,
+            engine,
+            directory=app.config['METRICS_DIR'] or None,
+            flush_interval=app.config['METRICS_FLUSH_INTERVAL_MS'] / 1000
+        )
+
+    def shard(self):
+        ident = self._ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            shard = self._shards[ident] = MetricsShard()
+        return shard
+
+    def observe_request(self, status, seconds, profile=None):
+        """Record a finished request of the current request context"""
+        blueprint = request.blueprint or ''
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        shard = self.shard()
+
+        key = (blueprint, route, request.method, status)
+        shard.requests[key] = shard.requests.get(key, 0) + 1
+
+        key = (blueprint, route, request.method)
+        histogram = shard.durations.get(key)
+        if histogram is None:
+            histogram = shard.durations[key] = new_histogram(REQUEST_BUCKETS)
+        observe(histogram, REQUEST_BUCKETS, seconds)
+
+        if profile is not None:
+            key = (blueprint, route)
+            totals = shard.queries.get(key)
+            if totals is None:
+                totals = shard.queries[key] = [0, 0.0]
+            totals[0] += profile.count
+            totals[1] += profile.duration
+
+    def observe_pool_wait(self, seconds):
+        observe(self.shard().pool_wait, POOL_WAIT_BUCKETS, seconds)
+
+    def collect(self):
+        """
+        Sum the shards and read the pool, cache and hashing gauges
+
+        Returns:
+            dict: Samples of this worker
+        """
+        samples = {}
+        for shard in list(self._shards.values()):
+            for (blueprint, route, method, status), count in list(shard.requests.items()):
+                labels = (('blueprint', blueprint), ('route', route), ('method', method), ('status', str(status)))
+                add_sample(samples, 'lms_http_requests_total', labels, count)
+            for (blueprint, route, method), histogram in list(shard.durations.items()):
+                labels = (('blueprint', blueprint), ('route', route), ('method', method))
+                add_sample(samples, 'lms_http_request_duration_seconds', labels, histogram)
+            for (blueprint, route), (statements, seconds) in list(shard.queries.items()):
+                labels = (('blueprint', blueprint), ('route', route))
+                add_sample(samples, 'lms_db_queries_total', labels, statements)
+                add_sample(samples, 'lms_db_query_seconds_total', labels, seconds)
+            add_sample(samples, 'lms_db_pool_checkout_wait_seconds', (), shard.pool_wait)
+            add_sample(samples, 'lms_http_requests_in_flight', (), shard.in_flight)
+
+        pool = self.engine.pool
+        if hasattr(pool, 'checkedout'):
+            add_sample(samples, 'lms_db_pool_connections_in_use', (), pool.checkedout())
+
+        # only what this worker already created, collecting never builds a cache or pool
+        extensions = self.app.extensions
+        for name, extension in (('read_through', 'read_cache'), ('tokens', 'token_cache')):
+            cache = extensions.get(extension)
+            if cache is None:
+                continue
+            stats = cache.stats()
+            labels = (('cache', name),)
+            add_sample(samples, 'lms_cache_hits_total', labels, stats['hits'])
+            add_sample(samples, 'lms_cache_misses_total', labels, stats['misses'])
+            # a shared cache reports the same size from every worker
+            if 'size' in stats and not stats.get('shared'):
+                add_sample(samples, 'lms_cache_entries', labels, stats['size'])
+
+        password_pool = extensions.get('password_pool')
+        if password_pool is not None:
+            stats = password_pool.stats()
+            add_sample(samples, 'lms_password_hash_queue_depth', (), stats['queue_depth'])
+            add_sample(samples, 'lms_password_hash_pending', (), stats['pending'])
+            add_sample(samples, 'lms_password_hash_rejected_total', (), stats['rejected'])
+
+        return samples
+
+    def start_flusher(self):
+        """
+        Start the snapshot thread of this process (once)
+
+        Started on the first request rather than in create_app, so a
+        worker forked from a preloaded app gets its own.
+        """
+        if self.directory is None or self._flusher_pid == os.getpid():
+            return
+        with self._flusher_lock:
+            if self._flusher_pid != os.getpid():
+                threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+                self._flusher_pid = os.getpid()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Writing the metrics snapshot failed')
+
+    def flush(self):
+        """
+        Write this worker's snapshot file
+
+        Collecting and writing happen under one lock, so a snapshot is
+        never replaced by an older one (counters in it only grow).
+        """
+        if self.directory is not None:
+            with self._flush_lock:
+                write_snapshot(os.path.join(self.directory, f'{os.getpid()}.json'), self.collect())
+
+    def aggregate(self):
+        """
+        Get the metrics of all workers
+
+        With a directory this worker flushes its own snapshot first and
+        every worker is read from its snapshot file: counting this one
+        live and the others from older snapshots would let the totals
+        go down when the next scrape lands on another worker.
+
+        Returns:
+            dict: Samples, with the cache hit ratios computed from the
+            summed hits and misses
+        """
+        if self.directory is None:
+            samples = self.collect()
+        else:
+            self.flush()
+            samples = {}
+            snapshots = []
+            with directory_lock(self.directory, exclusive=False):
+                for path in glob.glob(os.path.join(self.directory, '*.json')):
+                    other = read_snapshot(path)
+                    if other is not None:
+                        snapshots.append((os.path.basename(path)[:-len('.json')], other))
+
+            for stem, other in snapshots:
+                live = stem != ARCHIVE and stem.isdigit() and process_alive(int(stem))
+                merge(samples, other, gauges=live)
+
+        for labels, hits in samples.get('lms_cache_hits_total', {}).items():
+            lookups = hits + samples['lms_cache_misses_total'].get(labels, 0)
+            add_sample(samples, 'lms_cache_hit_ratio', labels, hits / lookups if lookups else 0.0)
+        return samples
+
+def add_submission_queue_samples(samples, stats):
+    """Add the ingestion queue gauges (one shared queue, not per worker)"""
+    add_sample(samples, 'lms_submission_queue_depth', (), stats['queued'])
+    add_sample(samples, 'lms_submission_queue_oldest_seconds', (), stats['oldest_queued_seconds'])
+
+def format_value(value):
+    if isinstance(value, float):
+        if value == float('inf'):
+            return '+Inf'
+        return repr(value)
+    return str(value)
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in labels) + '}'
+
+def render(samples):
+    """
+    Render samples in the Prometheus text exposition format (0.0.4)
+
+    Returns:
+        str: Exposition text
+    """
+    lines = []
+    for name, (kind, help_text) in FAMILIES.items():
+        family = samples.get(name)
+        if not family:
+            continue
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        for labels, value in sorted(family.items()):
+            if kind != 'histogram':
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(HISTOGRAM_BUCKETS[name] + (float('inf'),), value):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", format_value(float(bound))),))} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {format_value(value[-1])}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+def register_metrics(app, engine):
+    """
+    Collect request metrics for an app (METRICS_ENABLED)
+
+    Register after register_query_profiling: after_request hooks run in
+    reverse order, so the request's query profile is still there when
+    its statement count is recorded. Streamed response bodies (exports)
+    are timed up to their headers.
+
+    Args:
+        app (Flask): Flask app
+        engine (Engine): SQLAlchemy engine
+    """
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    metrics = RequestMetrics.from_config(app, engine)
+    app.extensions['metrics'] = metrics
+
+    if isinstance(engine.pool, TimedQueuePool):
+        engine.pool.on_checkout_wait = metrics.observe_pool_wait
+
+    if metrics.directory is not None:
+        os.makedirs(metrics.directory, exist_ok=True)
+        atexit.register(metrics.flush)
+
+    @app.before_request
+    def start_request_metrics():
+        metrics.start_flusher()
+        metrics.shard().in_flight += 1
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        started = g.get('metrics_started')
+        if started is not None:
+            metrics.observe_request(response.status_code, time.perf_counter() - started, current_profile())
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exception):
+        if g.pop('metrics_started', None) is not None:
+            metrics.shard().in_flight -= 1
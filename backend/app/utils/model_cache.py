@@ -0,0 +1,103 @@
+"""
+Model Cache Utilities
+Read-through caching of serialized courses and lessons
+"""
+
+from sqlalchemy import select
+from sqlalchemy.orm import undefer
+from app import db
+from app.models.course import Course
+from app.models.lesson import Lesson
+from app.utils.cache import get_cache
+
+# Entries are keyed by row version: every UPDATE bumps the version in
+# SQL, so an edit moves readers to a new key. A reader that loaded the
+# row before the edit can only store it under the old key, which no
+# one looks up any more, and nothing has to be invalidated (old
+# versions age out with CACHE_TTL). created_at is part of the key
+# because SQLite may hand the ID of a deleted row to a new one.
+
+def course_key(course_id, created_at, version):
+    return f'course:{course_id}:{created_at}:v{version}'
+
+def lesson_key(lesson_id, created_at, version):
+    return f'lesson:{lesson_id}:{created_at}:v{version}'
+
+def read_version(key, load):
+    """
+    Return the cached entry at key, calling load() on a miss
+
+    The loaded entry is stored under the key of the version it was
+    actually read at (a write may have landed in between).
+    """
+    cache = get_cache()
+    entry = cache.get(key)
+    if entry is None:
+        entry, key = load()
+        if entry is not None:
+            cache.set(key, entry)
+    return entry
+
+def load_course(course_id):
+    course = db.session.get(Course, course_id, populate_existing=True)
+    if course is None:
+        return None, None
+    entry = {'course': course.to_dict(), 'version': course.version}
+    return entry, course_key(course_id, course.created_at, course.version)
+
+def load_lesson(lesson_id):
+    lesson = db.session.get(Lesson, lesson_id, options=[undefer(Lesson.content)], populate_existing=True)
+    if lesson is None:
+        return None, None
+    entry = {'lesson': lesson.to_dict(), 'version': lesson.version}
+    return entry, lesson_key(lesson_id, lesson.created_at, lesson.version)
+
+def cached_course(course_id):
+    """
+    Get a serialized course through the read cache
+
+    Costs one primary key lookup of the course version.
+
+    Returns:
+        dict: {'course': Course.to_dict(), 'version': row version},
+        or None if the course does not exist
+    """
+    row = db.session.execute(
+        select(Course.created_at, Course.version).where(Course.id == course_id)
+    ).first()
+    if row is None:
+        return None
+    return read_version(course_key(course_id, *row), lambda: load_course(course_id))
+
+def cached_lesson(lesson_id):
+    """
+    Get a serialized lesson (with content) and its course through the
+    read cache
+
+    Costs one query for both row versions.
+
+    Returns:
+        tuple: (lesson entry, course entry) like cached_course's
+        ({'lesson': Lesson.to_dict(), 'version': row version}), or
+        (None, None) if the lesson does not exist
+    """
+    row = db.session.execute(
+        select(Lesson.created_at, Lesson.version, Lesson.course_id, Course.created_at, Course.version)
+        .join(Course, Course.id == Lesson.course_id)
+        .where(Lesson.id == lesson_id)
+    ).first()
+    if row is None:
+        return None, None
+
+    lesson_created_at, lesson_version, course_id, course_created_at, course_version = row
+    lesson_entry = read_version(
+        lesson_key(lesson_id, lesson_created_at, lesson_version),
+        lambda: load_lesson(lesson_id)
+    )
+    course_entry = read_version(
+        course_key(course_id, course_created_at, course_version),
+        lambda: load_course(course_id)
+    )
+    if lesson_entry is None or course_entry is None:
+        return None, None  # deleted in between
+    return lesson_entry, course_entry
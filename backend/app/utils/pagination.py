@@ -0,0 +1,97 @@
+"""
+Pagination Utilities
+Keyset (cursor) pagination helpers shared by list endpoints
+"""
+
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """
+    Parse the page size from a query string value
+
+    Args:
+        value (str): Raw 'limit' parameter (may be None)
+        default (int): Page size when no limit is given
+        maximum (int): Largest page size a client may request
+
+    Returns:
+        int: Page size
+
+    Raises:
+        ValueError: If the value is not a positive integer
+    """
+    if value is None or value == '':
+        return default
+
+    limit = int(value)
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+
+    return min(limit, maximum)
+
+def encode_cursor(sort_value, row_id):
+    """
+    Encode the position after a row as an opaque cursor
+
+    Args:
+        sort_value (datetime): Sort key of the last row on the page
+        row_id (int): Primary key of the last row (tie breaker)
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps([sort_value.isoformat(), row_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor (str): Cursor from a previous response
+
+    Returns:
+        tuple: (datetime, int) position to continue after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+def parse_fields(value, allowed):
+    """
+    Parse a comma separated sparse fieldset
+
+    Args:
+        value (str): Raw 'fields' parameter (may be None)
+        allowed (list): Field names the endpoint can return
+
+    Returns:
+        list: Requested field names, or all allowed fields if none given
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if not value:
+        return list(allowed)
+
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+
+    # always return the id so clients can address the row
+    if 'id' not in fields:
+        fields.insert(0, 'id')
+
+    return fields
@@ -0,0 +1,173 @@
+"""
+Password Hashers
+Pluggable password hashing schemes with cost parameters from config
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import bcrypt
+
+class BcryptHasher:
+    """
+    bcrypt with a configurable cost factor (log2 rounds)
+
+    Hash format: $2b$<rounds>$<salt+hash>
+    """
+
+    name = 'bcrypt'
+    prefixes = ('$2a$', '$2b$', '$2y$')
+
+    def __init__(self, rounds=12):
+        self.rounds = rounds
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(rounds=config['BCRYPT_ROUNDS'])
+
+    def identify(self, hashed_password):
+        return hashed_password.startswith(self.prefixes)
+
+    def hash(self, password):
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password, hashed_password):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def needs_rehash(self, hashed_password):
+        return int(hashed_password.split('$')[2]) != self.rounds
+
+class ScryptHasher:
+    """
+    scrypt from the standard library (memory-hard)
+
+    Verifying costs memory as well as CPU, which makes GPU cracking
+    expensive while keeping per-login latency lower than bcrypt.
+
+    Hash format: $scrypt$ln=<log2 n>,r=<r>,p=<p>$<salt>$<hash>
+    """
+
+    name = 'scrypt'
+    prefixes = ('$scrypt$',)
+    salt_size = 16
+    key_size = 32
+
+    def __init__(self, log_n=14, r=8, p=1):
+        self.log_n = log_n
+        self.r = r
+        self.p = p
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(log_n=config['SCRYPT_LOG_N'], r=config['SCRYPT_R'], p=config['SCRYPT_P'])
+
+    def identify(self, hashed_password):
+        return hashed_password.startswith(self.prefixes)
+
+    def _derive(self, password, salt, log_n, r, p):
+        n = 2 ** log_n
+        return hashlib.scrypt(
+            password.encode('utf-8'),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p,
+            dklen=self.key_size
+        )
+
+    def hash(self, password):
+        salt = os.urandom(self.salt_size)
+        key = self._derive(password, salt, self.log_n, self.r, self.p)
+        return '$scrypt$ln={},r={},p={}${}${}'.format(
+            self.log_n, self.r, self.p, _b64encode(salt), _b64encode(key)
+        )
+
+    def verify(self, password, hashed_password):
+        log_n, r, p, salt, key = self._parse(hashed_password)
+        return hmac.compare_digest(self._derive(password, salt, log_n, r, p), key)
+
+    def needs_rehash(self, hashed_password):
+        log_n, r, p, _, _ = self._parse(hashed_password)
+        return (log_n, r, p) != (self.log_n, self.r, self.p)
+
+    def _parse(self, hashed_password):
+        """Split a hash into its parts (ValueError if it is malformed)"""
+        try:
+            _, _, params, salt, key = hashed_password.split('$')
+            values = dict(item.split('=') for item in params.split(','))
+            return int(values['ln']), int(values['r']), int(values['p']), _b64decode(salt), _b64decode(key)
+        except (IndexError, KeyError) as e:
+            raise ValueError('Malformed scrypt hash') from e
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+def _b64decode(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+# available hashers, selected by the PASSWORD_HASHER setting
+HASHERS = {
+    BcryptHasher.name: BcryptHasher,
+    ScryptHasher.name: ScryptHasher,
+}
+
+def register_hasher(hasher_class):
+    """
+    Register an additional hasher class
+
+    The class needs a unique 'name', a from_config(config) classmethod
+    and identify, hash, verify and needs_rehash methods.
+    """
+    HASHERS[hasher_class.name] = hasher_class
+    return hasher_class
+
+class PasswordHasherRegistry:
+    """
+    Configured hashers: the default one for new hashes plus every
+    registered hasher for verifying existing ones
+    """
+
+    def __init__(self, config):
+        default_name = config['PASSWORD_HASHER']
+        if default_name not in HASHERS:
+            raise ValueError(f'Unknown PASSWORD_HASHER "{default_name}"')
+
+        self.hashers = [hasher_class.from_config(config) for hasher_class in HASHERS.values()]
+        self.default = next(hasher for hasher in self.hashers if hasher.name == default_name)
+
+    def identify(self, hashed_password):
+        """Return the hasher that produced a hash, or None"""
+        for hasher in self.hashers:
+            if hasher.identify(hashed_password):
+                return hasher
+        return None
+
+    def hash(self, password):
+        return self.default.hash(password)
+
+    def verify(self, password, hashed_password):
+        hasher = self.identify(hashed_password)
+        if hasher is None:
+            return False
+        try:
+            return hasher.verify(password, hashed_password)
+        except (ValueError, IndexError, KeyError):
+            return False  # malformed hash
+
+    def needs_rehash(self, hashed_password):
+        """
+        Check whether a hash should be replaced on the next login
+
+        True when it was made by another scheme than the default or
+        with outdated cost parameters.
+        """
+        hasher = self.identify(hashed_password)
+        if hasher is not self.default:
+            return True
+        try:
+            return hasher.needs_rehash(hashed_password)
+        except (ValueError, IndexError, KeyError):
+            return True
@@ -0,0 +1,195 @@
+"""
+Request Query Profiling
+Counts and times the SQL statements of each request, reports them in
+Server-Timing headers and structured logs and flags N+1 patterns
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# longest statement text kept in logs
+MAX_STATEMENT_LENGTH = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_PLACEHOLDER = re.compile(r'%\(\w+\)s|%s|(?<!:):\w+|\$\d+')
+_WHITESPACE = re.compile(r'\s+')
+
+def statement_shape(statement):
+    """
+    Normalize a SQL statement to its shape
+
+    Literals and placeholders become '?' and IN lists collapse to one
+    placeholder, so the per-row queries of a loop share one shape.
+
+    Args:
+        statement (str): SQL text as sent to the driver
+
+    Returns:
+        str: Normalized statement
+    """
+    shape = _STRING_LITERAL.sub('?', statement)
+    shape = _PLACEHOLDER.sub('?', shape)
+    shape = _NUMBER_LITERAL.sub('?', shape)
+    shape = _PLACEHOLDER_LIST.sub('(?)', shape)
+    return _WHITESPACE.sub(' ', shape).strip()
+
+class QueryProfile:
+    """
+    SQL statements run while serving one request
+
+    Only counters, the slowest statement and a Counter of distinct
+    statements are kept, so long requests do not pile up statement
+    text; statements are normalized to shapes only when checked.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_statement = None
+        self.statements = Counter()
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        if duration > self.slowest_duration:
+            self.slowest_duration = duration
+            self.slowest_statement = statement
+        self.statements[statement] += 1
+
+    def repeated(self, threshold):
+        """
+        Statement shapes run more than threshold times (N+1 suspects)
+
+        Returns:
+            list: (shape, count) pairs, most repeated first
+        """
+        if self.count <= threshold:
+            return []
+        shapes = Counter()
+        for statement, count in self.statements.items():
+            shapes[statement_shape(statement)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count > threshold]
+
+    def server_timing(self):
+        """
+        Build the Server-Timing header value
+
+        Returns:
+            str: db (query time and count) and app (whole request) metrics
+        """
+        elapsed = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries", '
+            f'app;dur={elapsed:.2f}'
+        )
+
+def current_profile():
+    """
+    Get the query profile of the current request
+
+    Returns:
+        QueryProfile: Profile, or None outside a profiled request
+    """
+    if not has_request_context():
+        return None
+    return g.get('query_profile')
+
+def register_query_profiling(app, engine):
+    """
+    Profile the SQL statements of every request of an app
+
+    Engine events time each statement; statements run outside a request
+    (CLI commands, the submission drain thread) are ignored. After the
+    request the totals go to the Server-Timing header
+    (QUERY_PROFILING_SERVER_TIMING) and to a JSON log line: at INFO for
+    every request with QUERY_PROFILING_LOG_ALL, at WARNING when a
+    statement took QUERY_SLOW_MS or more or a statement shape repeated
+    more than QUERY_N_PLUS_ONE_THRESHOLD times.
+
+    Streamed response bodies (exports) run their queries after the
+    headers are sent; those are not included.
+
+    Args:
+        app (Flask): Flask app
+        engine (Engine): SQLAlchemy engine
+    """
+    config = app.config
+    if not config['QUERY_PROFILING']:
+        return
+
+    server_timing = config['QUERY_PROFILING_SERVER_TIMING']
+    log_all = config['QUERY_PROFILING_LOG_ALL']
+    slow_seconds = config['QUERY_SLOW_MS'] / 1000
+    repeat_threshold = config['QUERY_N_PLUS_ONE_THRESHOLD']
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_started'].pop()
+        profile = current_profile()
+        if profile is not None:
+            profile.record(statement, time.perf_counter() - started)
+
+    @event.listens_for(engine, 'handle_error')
+    def drop_timer(exception_context):
+        # a failed statement never reaches after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get('query_started'):
+            connection.info['query_started'].pop()
+
+    @app.before_request
+    def start_profile():
+        g.query_profile = QueryProfile()
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('query_profile', None)
+        if profile is None:
+            return response
+
+        if server_timing:
+            response.headers.add('Server-Timing', profile.server_timing())
+
+        repeated = profile.repeated(repeat_threshold)
+        slow = profile.slowest_duration >= slow_seconds
+        if repeated or slow:
+            level = logging.WARNING
+        elif log_all:
+            level = logging.INFO
+        else:
+            return response
+
+        if logger.isEnabledFor(level):
+            record = {
+                'event': 'request_queries',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - profile.started) * 1000, 2),
+                'queries': profile.count,
+                'db_ms': round(profile.duration * 1000, 2),
+                'slowest_ms': round(profile.slowest_duration * 1000, 2),
+                'slowest_statement': (profile.slowest_statement or '')[:MAX_STATEMENT_LENGTH],
+            }
+            if repeated:
+                record['n_plus_one'] = [
+                    {'statement': shape[:MAX_STATEMENT_LENGTH], 'count': count}
+                    for shape, count in repeated
+                ]
+            logger.log(level, json.dumps(record))
+        return response
@@ -0,0 +1,100 @@
+"""
+Progress Rollup Utilities
+Keep the course_progress rollup in step with Progress rows
+"""
+
+from sqlalchemy import and_, func, select, update
+from app import db
+from app.models.lesson import Lesson
+from app.models.progress import Progress
+from app.models.course_progress import CourseProgress
+from app.utils.database import upsert_insert
+
+def upsert_course_progress(*conditions):
+    """
+    Build the grouped INSERT ... SELECT ... ON CONFLICT DO UPDATE that
+    recounts completed lessons per (student, course)
+
+    Args:
+        *conditions: Filters on Progress/Lesson picking the rows to count
+
+    Returns:
+        Insert: Upsert statement, one course_progress row per group
+    """
+    counts = (
+        select(
+            Progress.student_id,
+            Lesson.course_id,
+            func.count(Progress.id),
+            func.max(Progress.completed_at)
+        )
+        .join(Lesson, Lesson.id == Progress.lesson_id)
+        .where(Progress.completed.is_(True), *conditions)
+        .group_by(Progress.student_id, Lesson.course_id)
+    )
+
+    statement = upsert_insert(CourseProgress).from_select(
+        ['student_id', 'course_id', 'completed_count', 'last_activity'],
+        counts
+    )
+    return statement.on_conflict_do_update(
+        index_elements=['student_id', 'course_id'],
+        set_={
+            'completed_count': statement.excluded.completed_count,
+            'last_activity': statement.excluded.last_activity
+        }
+    )
+
+def refresh_course_progress(student_id, lesson_ids):
+    """
+    Recount a student's completed lessons in the courses of lesson_ids
+
+    One grouped INSERT ... SELECT ... ON CONFLICT DO UPDATE, touching
+    only that student's progress rows in those courses. Call it in the
+    same transaction as the Progress write.
+
+    Args:
+        student_id (int): Student whose progress changed
+        lesson_ids (list): Lessons that were just completed
+    """
+    if not lesson_ids:
+        return
+
+    course_ids = select(Lesson.course_id).where(Lesson.id.in_(list(lesson_ids)))
+    db.session.execute(upsert_course_progress(
+        Progress.student_id == student_id,
+        Lesson.course_id.in_(course_ids)
+    ))
+
+def discount_lesson_progress(lesson):
+    """
+    Recount the rollup of every student who completed a lesson, as if
+    it were already deleted (call it before deleting the lesson)
+
+    Their rows are reset first, then the grouped upsert of
+    refresh_course_progress() recounts completed_count and last_activity
+    from their other lessons in the course; students with none left keep
+    the reset row. O(progress rows of those students in the course).
+
+    Args:
+        lesson (Lesson): Lesson about to be deleted
+    """
+    completed_by = select(Progress.student_id).where(
+        Progress.lesson_id == lesson.id,
+        Progress.completed.is_(True)
+    )
+
+    db.session.execute(
+        update(CourseProgress)
+        .where(and_(
+            CourseProgress.course_id == lesson.course_id,
+            CourseProgress.student_id.in_(completed_by)
+        ))
+        .values(completed_count=0, last_activity=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.execute(upsert_course_progress(
+        Progress.student_id.in_(completed_by),
+        Lesson.course_id == lesson.course_id,
+        Progress.lesson_id != lesson.id
+    ))
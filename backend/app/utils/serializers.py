@@ -0,0 +1,53 @@
+"""
+Row Serializers
+Schema-driven serialization of query rows, without ORM objects
+"""
+
+class RowSchema:
+    """
+    Maps response field names to SQL column expressions
+
+    select() labels each column with its field name, so every result
+    row can be turned into a response dict with Row._asdict() instead
+    of loading ORM objects and calling to_dict(). Datetime values are
+    left as is for the JSON provider to encode.
+
+    Usage:
+        schema = RowSchema(id=Course.id, title=Course.title)
+        rows = db.session.execute(select(*schema.columns()).where(...))
+        data = schema.dump(rows)
+    """
+
+    def __init__(self, **fields):
+        self.fields = fields
+
+    @property
+    def names(self):
+        return list(self.fields)
+
+    def columns(self, names=None):
+        """
+        Labeled column expressions for the given fields (default: all)
+
+        Raises:
+            KeyError: If a name is not part of the schema
+        """
+        names = self.names if names is None else names
+        return [self.fields[name].label(name) for name in names]
+
+    @staticmethod
+    def dump(rows, names=None):
+        """
+        Convert result rows to dictionaries
+
+        Args:
+            rows: Iterable of rows selected through columns()
+            names (list): Only keep these fields (default: every column)
+
+        Returns:
+            list: One dict per row
+        """
+        if names is None:
+            return [row._asdict() for row in rows]
+
+        return [{name: row._mapping[name] for name in names} for row in rows]
@@ -0,0 +1,117 @@
+"""
+Worker Pool Utilities
+Bounded thread pool for CPU heavy work such as password hashing
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+def thread_pool_class():
+    """
+    Executor class running jobs on native OS threads
+
+    Under gevent's monkey patching (gunicorn's gevent workers) plain
+    threads become greenlets, and CPU bound jobs would block every
+    other request of the worker; gevent's own executor keeps them on
+    real threads.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return ThreadPoolExecutor
+
+    if monkey.is_module_patched('threading'):
+        from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+        return NativeThreadPoolExecutor
+    return ThreadPoolExecutor
+
+class PoolBusyError(Exception):
+    """Raised when a BoundedExecutor has no free worker or queue slot"""
+
+    def __init__(self, retry_after=1):
+        super().__init__('Server is busy, please retry shortly')
+        self.retry_after = retry_after
+
+class BoundedExecutor:
+    """
+    Thread pool that refuses work instead of queueing without limit
+
+    At most max_workers jobs run at once and at most max_queue more
+    wait for a worker; anything beyond that raises PoolBusyError right
+    away so the request can be answered with 503 instead of piling up.
+
+    Usage:
+        pool = BoundedExecutor(max_workers=4, max_queue=16)
+        result = pool.run(expensive_function, arg)
+    """
+
+    def __init__(self, max_workers, max_queue, retry_after=1, name='worker'):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.rejected = 0
+        self._executor = thread_pool_class()(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """Number of jobs running or waiting for a worker"""
+        return self._pending
+
+    @property
+    def queue_depth(self):
+        """Number of jobs waiting for a worker"""
+        return max(0, self._pending - self.max_workers)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Schedule fn(*args, **kwargs) on the pool
+
+        Returns:
+            Future: Future for the result
+
+        Raises:
+            PoolBusyError: If every worker and queue slot is taken
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PoolBusyError(self.retry_after)
+
+        with self._lock:
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """Run fn on the pool and wait for its result"""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def stats(self):
+        """
+        Get pool statistics
+
+        Returns:
+            dict: workers, queue limit, pending, queue depth and rejections
+        """
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'pending': self.pending,
+            'queue_depth': self.queue_depth,
+            'rejected': self.rejected
+        }
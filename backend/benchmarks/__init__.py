@@ -0,0 +1 @@
+# empty file to make 'benchmarks' a Python package
\ No newline at end of file
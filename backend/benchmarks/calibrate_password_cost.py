@@ -0,0 +1,56 @@
+"""
+Password Cost Calibration
+Measures verify latency for each bcrypt and scrypt cost setting on
+this machine and recommends the highest cost under a target latency
+
+Usage (from the backend directory):
+    python -m benchmarks.calibrate_password_cost [target_ms]
+"""
+
+import sys
+import time
+from app.utils.passwords import BcryptHasher, ScryptHasher
+
+DEFAULT_TARGET_MS = 250
+SAMPLES = 3
+
+def verify_ms(hasher):
+    """Median verify time of a hasher in milliseconds"""
+    hashed = hasher.hash('calibration-password')
+    timings = []
+    for _ in range(SAMPLES):
+        started = time.perf_counter()
+        hasher.verify('calibration-password', hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+def calibrate(label, setting, candidates, target_ms):
+    """
+    Time each candidate (in increasing cost order) until one exceeds
+    the target; return the last value that stayed under it
+    """
+    best = None
+    print(f'{label}:')
+    for value, hasher in candidates:
+        elapsed = verify_ms(hasher)
+        print(f'  {setting}={value:<3} {elapsed:8.1f} ms')
+        if elapsed > target_ms:
+            break
+        best = value
+    return best
+
+def main():
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TARGET_MS
+    print(f'target verify latency: {target_ms:.0f} ms')
+
+    rounds = calibrate('bcrypt', 'BCRYPT_ROUNDS',
+                       [(r, BcryptHasher(rounds=r)) for r in range(10, 17)], target_ms)
+    log_n = calibrate('scrypt', 'SCRYPT_LOG_N',
+                      [(n, ScryptHasher(log_n=n)) for n in range(12, 20)], target_ms)
+
+    print('recommended settings:')
+    print(f'  BCRYPT_ROUNDS={rounds}' if rounds else '  bcrypt: even the lowest cost exceeds the target')
+    print(f'  SCRYPT_LOG_N={log_n}' if log_n else '  scrypt: even the lowest cost exceeds the target')
+
+if __name__ == '__main__':
+    main()
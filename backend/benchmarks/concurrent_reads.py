@@ -0,0 +1,190 @@
+"""
+Concurrent Read Load Test
+Starts gunicorn with each worker class and drives the read endpoints
+(catalog, course, lesson, my-courses) with many concurrent clients
+
+Usage (from the backend directory):
+    python -m benchmarks.concurrent_reads [--clients 500] [--seconds 10] [--workers 2]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET_KEY = 'concurrent-reads-benchmark-secret-key-0123456789'
+
+COURSES = 200
+LESSONS_PER_COURSE = 10
+ENROLLED_COURSES = 50
+
+def seed(database_uri):
+    """
+    Create an instructor, a student and the catalog
+
+    Returns:
+        tuple: (student token, course IDs, lesson IDs of enrolled courses)
+    """
+    from app import create_app, db
+    from app.models import User, Course, Lesson, Enrollment
+    from app.utils.auth import generate_token
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_uri, 'SECRET_KEY': SECRET_KEY})
+    with app.app_context():
+        instructor = User(email='instructor@bench.test', password_hash='x',
+                          full_name='Bench Instructor', role='instructor')
+        student = User(email='student@bench.test', password_hash='x',
+                       full_name='Bench Student', role='student')
+        db.session.add_all([instructor, student])
+        db.session.flush()
+
+        courses = [
+            Course(title=f'Course {i}', description='A course description ' * 10,
+                   instructor_id=instructor.id)
+            for i in range(COURSES)
+        ]
+        db.session.add_all(courses)
+        db.session.flush()
+
+        lesson_ids = []
+        for course in courses[:ENROLLED_COURSES]:
+            db.session.add(Enrollment(student_id=student.id, course_id=course.id))
+            lessons = [
+                Lesson(course_id=course.id, title=f'Lesson {index}',
+                       content='Lesson text ' * 200, order_index=index)
+                for index in range(LESSONS_PER_COURSE)
+            ]
+            db.session.add_all(lessons)
+            db.session.flush()
+            lesson_ids.extend(lesson.id for lesson in lessons)
+        db.session.commit()
+
+        return generate_token(student.id, student.role), [course.id for course in courses[:ENROLLED_COURSES]], lesson_ids
+
+def start_server(database_uri, worker_class, workers, port):
+    """Start gunicorn and wait until it answers"""
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_uri,
+        SECRET_KEY=SECRET_KEY,
+        DB_AUTO_MIGRATE='0',
+        GUNICORN_WORKER_CLASS=worker_class,
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_BIND=f'127.0.0.1:{port}',
+        GUNICORN_ACCESS_LOG='',
+        GUNICORN_LOG_LEVEL='warning',
+        GUNICORN_MAX_REQUESTS='0',  # no worker recycling during the run
+    )
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=BACKEND_DIR, env=env
+    )
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError(f'gunicorn ({worker_class}) did not start')
+
+async def client(port, token, paths, stop_at, latencies, errors):
+    """One keep-alive client sending GETs until stop_at (reconnects if dropped)"""
+    writer = None
+    while time.perf_counter() < stop_at:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+            path = random.choice(paths)
+            request = (
+                f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                f'Authorization: Bearer {token}\r\n\r\n'
+            )
+            started = time.perf_counter()
+            writer.write(request.encode('ascii'))
+
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                if name.lower() == 'content-length':
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+        except (OSError, asyncio.IncompleteReadError, IndexError, ValueError):
+            errors.append('connection')
+            if writer is not None:
+                writer.close()
+            writer = None
+
+    if writer is not None:
+        writer.close()
+
+async def run_load(port, token, paths, clients, seconds):
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + seconds
+    await asyncio.gather(*[
+        client(port, token, paths, stop_at, latencies, errors) for _ in range(clients)
+    ])
+    return latencies, errors
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--seconds', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-classes', default='gthread,gevent')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = f'sqlite:///{os.path.join(directory, "bench.db")}'
+        token, course_ids, lesson_ids = seed(database_uri)
+
+        paths = (
+            ['/api/courses?limit=50', '/api/courses/my-courses']
+            + [f'/api/courses/{course_id}' for course_id in course_ids[:20]]
+            + [f'/api/lessons/{lesson_id}' for lesson_id in lesson_ids[:20]]
+        )
+
+        print(f'{args.clients} clients, {args.seconds}s, {args.workers} workers')
+        print(f'{"worker":>8} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7}')
+        for port, worker_class in enumerate(args.worker_classes.split(','), start=5091):
+            process = start_server(database_uri, worker_class, args.workers, port)
+            try:
+                latencies, errors = asyncio.run(run_load(port, token, paths, args.clients, args.seconds))
+            finally:
+                process.terminate()
+                process.wait()
+
+            latencies.sort()
+            if not latencies:
+                print(f'{worker_class:>8} no successful requests ({len(errors)} errors)')
+                continue
+            print(
+                f'{worker_class:>8} {len(latencies) / args.seconds:>8.0f} '
+                f'{percentile(latencies, 0.50) * 1000:>8.1f} '
+                f'{percentile(latencies, 0.95) * 1000:>8.1f} '
+                f'{percentile(latencies, 0.99) * 1000:>8.1f} {len(errors):>7}'
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+"""
+Synthetic LMS Dataset Generator
+Bulk-loads users, courses, lessons, enrollments, progress, assignments
+and submissions at benchmark scale through Core executemany inserts
+
+Usage (from the backend directory):
+    python -m benchmarks.dataset --scale full --database sqlite:////tmp/lms_bench.db
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+from app import create_app, db
+from app.models import User, Course, Lesson, Enrollment, Progress, Assignment, Submission
+from app.utils.passwords import BcryptHasher
+
+# password of every generated account
+PASSWORD = 'benchmark-password'
+
+# rows per executemany call
+CHUNK_SIZE = 20000
+
+SCALES = {
+    # users, instructors, courses, lessons per course, enrollments per
+    # student, assignments per course, submission rate
+    'small': dict(users=1000, instructors=20, courses=50, lessons_per_course=40,
+                  enrollments_per_student=5, assignments_per_course=3, submission_rate=0.3),
+    'medium': dict(users=10000, instructors=200, courses=500, lessons_per_course=40,
+                   enrollments_per_student=5, assignments_per_course=3, submission_rate=0.3),
+    'full': dict(users=100000, instructors=2000, courses=5000, lessons_per_course=40,
+                 enrollments_per_student=5, assignments_per_course=3, submission_rate=0.3),
+}
+
+def bulk_insert(model, rows):
+    """
+    Insert an iterable of row dicts in CHUNK_SIZE executemany batches
+
+    Returns:
+        int: Number of rows inserted
+    """
+    statement = insert(model.__table__)
+    count = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            db.session.execute(statement, chunk)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        db.session.execute(statement, chunk)
+        count += len(chunk)
+    return count
+
+class DatasetGenerator:
+    """
+    Deterministic synthetic dataset (same seed, same rows)
+
+    IDs are assigned here instead of by the database, so related rows
+    can be generated without reading anything back. Instructors are
+    users 1..instructors, students follow.
+    """
+
+    def __init__(self, users, instructors, courses, lessons_per_course,
+                 enrollments_per_student, assignments_per_course, submission_rate, seed=42):
+        self.users = users
+        self.instructors = instructors
+        self.courses = courses
+        self.lessons_per_course = lessons_per_course
+        self.enrollments_per_student = enrollments_per_student
+        self.assignments_per_course = assignments_per_course
+        self.submission_rate = submission_rate
+        self.seed = seed
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.start = self.now - timedelta(days=365)
+
+    def rng(self, table):
+        # one stream per table, so tables can be generated independently
+        return random.Random(f'{self.seed}:{table}')
+
+    def moment(self, rng):
+        """Random time within the last year"""
+        return self.start + timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+
+    def student_ids(self):
+        return range(self.instructors + 1, self.users + 1)
+
+    def course_lesson_ids(self, course_id):
+        first = (course_id - 1) * self.lessons_per_course + 1
+        return range(first, first + self.lessons_per_course)
+
+    def course_assignment_ids(self, course_id):
+        first = (course_id - 1) * self.assignments_per_course + 1
+        return range(first, first + self.assignments_per_course)
+
+    def enrollment_plan(self):
+        """(student_id, course IDs) pairs; the same on every call"""
+        rng = self.rng('plan')
+        count = min(self.enrollments_per_student, self.courses)
+        for student_id in self.student_ids():
+            yield student_id, rng.sample(range(1, self.courses + 1), count)
+
+    def user_rows(self, password_hash):
+        rng = self.rng('users')
+        for user_id in range(1, self.users + 1):
+            role = 'instructor' if user_id <= self.instructors else 'student'
+            yield {
+                'id': user_id,
+                'email': f'{role}{user_id}@bench.test',
+                'password_hash': password_hash,
+                'full_name': f'{role.title()} {user_id}',
+                'role': role,
+                'created_at': self.moment(rng)
+            }
+
+    def course_rows(self):
+        rng = self.rng('courses')
+        for course_id in range(1, self.courses + 1):
+            created_at = self.moment(rng)
+            yield {
+                'id': course_id,
+                'title': f'Course {course_id}: {rng.choice(["Intro to", "Advanced", "Applied"])} '
+                         f'{rng.choice(["Python", "Databases", "Networks", "Statistics", "Design"])}',
+                'description': 'Synthetic course description. ' * rng.randint(2, 20),
+                'instructor_id': rng.randint(1, self.instructors),
+                'created_at': created_at,
+                'updated_at': created_at
+            }
+
+    def lesson_rows(self):
+        rng = self.rng('lessons')
+        for course_id in range(1, self.courses + 1):
+            for index, lesson_id in enumerate(self.course_lesson_ids(course_id), start=1):
+                created_at = self.moment(rng)
+                yield {
+                    'id': lesson_id,
+                    'course_id': course_id,
+                    'title': f'Lesson {index}',
+                    'content': 'Synthetic lesson text. ' * rng.randint(10, 100),
+                    'order_index': index,
+                    'created_at': created_at,
+                    'updated_at': created_at
+                }
+
+    def enrollment_rows(self):
+        rng = self.rng('enrollments')
+        for student_id, courses in self.enrollment_plan():
+            for course_id in courses:
+                yield {
+                    'student_id': student_id,
+                    'course_id': course_id,
+                    'enrolled_at': self.moment(rng)
+                }
+
+    def progress_rows(self):
+        rng = self.rng('progress')
+        for student_id, courses in self.enrollment_plan():
+            for course_id in courses:
+                # students work through lessons in order, most only start
+                completed = rng.randint(0, self.lessons_per_course // 4)
+                for lesson_id in self.course_lesson_ids(course_id)[:completed]:
+                    yield {
+                        'student_id': student_id,
+                        'lesson_id': lesson_id,
+                        'completed': True,
+                        'completed_at': self.moment(rng)
+                    }
+
+    def assignment_rows(self):
+        rng = self.rng('assignments')
+        for course_id in range(1, self.courses + 1):
+            for number, assignment_id in enumerate(self.course_assignment_ids(course_id), start=1):
+                yield {
+                    'id': assignment_id,
+                    'course_id': course_id,
+                    'title': f'Assignment {number}',
+                    'description': 'Synthetic assignment. ' * rng.randint(5, 30),
+                    'due_date': self.moment(rng) + timedelta(days=30),
+                    'max_points': 100,
+                    'created_at': self.moment(rng)
+                }
+
+    def submission_rows(self):
+        rng = self.rng('submissions')
+        for student_id, courses in self.enrollment_plan():
+            for course_id in courses:
+                for assignment_id in self.course_assignment_ids(course_id):
+                    if rng.random() >= self.submission_rate:
+                        continue
+                    yield {
+                        'assignment_id': assignment_id,
+                        'student_id': student_id,
+                        'content': 'Synthetic answer. ' * rng.randint(5, 50),
+                        'submitted_at': self.moment(rng),
+                        'grade': rng.choice([None, rng.randint(40, 100)])
+                    }
+
+def rebuild_course_progress():
+    """
+    Fill the course_progress rollup from the progress rows
+
+    Returns:
+        int: Number of rollup rows
+    """
+    return db.session.execute(text(
+        'INSERT INTO course_progress (student_id, course_id, completed_count, last_activity) '
+        'SELECT progress.student_id, lessons.course_id, count(progress.id), max(progress.completed_at) '
+        'FROM progress JOIN lessons ON lessons.id = progress.lesson_id '
+        'WHERE progress.completed '
+        'GROUP BY progress.student_id, lessons.course_id'
+    )).rowcount
+
+def generate(generator, hash_rounds=4):
+    """
+    Load the whole dataset into the current app's empty database
+
+    Every table is loaded in its own transaction. Must run inside an
+    app context.
+
+    Args:
+        generator (DatasetGenerator): Dataset to load
+        hash_rounds (int): bcrypt cost of the shared password hash
+
+    Returns:
+        list: (table, rows, seconds) per table
+    """
+    if db.session.execute(text('SELECT count(*) FROM users')).scalar():
+        raise RuntimeError('The database already has users, generate into an empty database')
+
+    password_hash = BcryptHasher(rounds=hash_rounds).hash(PASSWORD)
+    steps = [
+        ('users', lambda: bulk_insert(User, generator.user_rows(password_hash))),
+        ('courses', lambda: bulk_insert(Course, generator.course_rows())),
+        ('lessons', lambda: bulk_insert(Lesson, generator.lesson_rows())),
+        ('enrollments', lambda: bulk_insert(Enrollment, generator.enrollment_rows())),
+        ('progress', lambda: bulk_insert(Progress, generator.progress_rows())),
+        ('course_progress', rebuild_course_progress),
+        ('assignments', lambda: bulk_insert(Assignment, generator.assignment_rows())),
+        ('submissions', lambda: bulk_insert(Submission, generator.submission_rows())),
+    ]
+
+    report = []
+    for table, load in steps:
+        started = time.perf_counter()
+        rows = load()
+        db.session.commit()
+        report.append((table, rows, time.perf_counter() - started))
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic LMS dataset')
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--database', default='sqlite:////tmp/lms_bench.db',
+                        help='Database URI (must be empty; the schema is migrated)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': args.database})
+    generator = DatasetGenerator(seed=args.seed, **SCALES[args.scale])
+
+    with app.app_context():
+        started = time.perf_counter()
+        report = generate(generator)
+        elapsed = time.perf_counter() - started
+
+    print(f'{"table":>16} {"rows":>10} {"seconds":>8}')
+    for table, rows, seconds in report:
+        print(f'{table:>16} {rows:>10} {seconds:>8.2f}')
+    print(f'{"total":>16} {sum(rows for _, rows, _ in report):>10} {elapsed:>8.2f}')
+    print(f'Every account uses the password "{PASSWORD}"')
+
+if __name__ == '__main__':
+    main()
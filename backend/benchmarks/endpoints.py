@@ -0,0 +1,339 @@
+"""
+Endpoint Benchmark
+Drives every API endpoint against a generated dataset and reports
+p50/p95/p99 latency, throughput and SQL queries per endpoint
+
+Usage (from the backend directory):
+    python -m benchmarks.dataset --scale medium
+    python -m benchmarks.endpoints --save baseline.json
+    python -m benchmarks.endpoints --compare baseline.json
+
+With --compare the exit status is 1 when an endpoint got slower than
+the baseline (p95 beyond --tolerance) or runs more queries per request.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from app import create_app, db
+from app.models import User, Course, Lesson, Enrollment, Assignment, Submission
+from app.utils.auth import generate_token
+from benchmarks.dataset import PASSWORD
+
+SAMPLE_SIZE = 200
+
+class Samples:
+    """
+    IDs the requests are built from, read from the benchmark database
+
+    Every student sample comes with one of its enrolled courses, so
+    student requests hit data they may see.
+    """
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.enrollments = db.session.execute(
+            select(Enrollment.student_id, Enrollment.course_id)
+            .order_by(func.random()).limit(SAMPLE_SIZE)
+        ).all()
+        self.courses = db.session.execute(
+            select(Course.id, Course.instructor_id)
+            .order_by(func.random()).limit(SAMPLE_SIZE)
+        ).all()
+        if not self.enrollments or not self.courses:
+            raise RuntimeError('The database has no enrollments, run python -m benchmarks.dataset first')
+
+        course_ids = {course_id for _, course_id in self.enrollments} | {course_id for course_id, _ in self.courses}
+        self.lessons = {}
+        for lesson_id, course_id in db.session.execute(
+            select(Lesson.id, Lesson.course_id).where(Lesson.course_id.in_(course_ids))
+        ):
+            self.lessons.setdefault(course_id, []).append(lesson_id)
+        self.assignments = {}
+        for assignment_id, course_id in db.session.execute(
+            select(Assignment.id, Assignment.course_id).where(Assignment.course_id.in_(course_ids))
+        ):
+            self.assignments.setdefault(course_id, []).append(assignment_id)
+
+        self.submissions = {}
+        assignment_ids = [ids[0] for ids in self.assignments.values()]
+        for submission_id, assignment_id in db.session.execute(
+            select(Submission.id, Submission.assignment_id).where(Submission.assignment_id.in_(assignment_ids))
+        ):
+            self.submissions.setdefault(assignment_id, []).append(submission_id)
+
+        self.emails = dict(db.session.execute(
+            select(User.id, User.email).where(User.id.in_(
+                [student_id for student_id, _ in self.enrollments[:20]]
+            ))
+        ).all())
+        self._tokens = {}
+
+    def token(self, user_id, role):
+        key = (user_id, role)
+        if key not in self._tokens:
+            self._tokens[key] = generate_token(user_id, role)
+        return self._tokens[key]
+
+    def student(self):
+        """(student auth header, enrolled course ID)"""
+        student_id, course_id = self.rng.choice(self.enrollments)
+        return self.header(student_id, 'student'), course_id
+
+    def instructor(self):
+        """(instructor auth header, one of their course IDs)"""
+        course_id, instructor_id = self.rng.choice(self.courses)
+        return self.header(instructor_id, 'instructor'), course_id
+
+    def header(self, user_id, role):
+        return {'Authorization': f'Bearer {self.token(user_id, role)}'}
+
+    def lesson(self, course_id):
+        return self.rng.choice(self.lessons[course_id])
+
+    def assignment(self, course_id):
+        return self.assignments[course_id][0]
+
+# Each scenario builds one request: (method, url, headers, json body)
+
+def health(samples):
+    return 'GET', '/api/health', {}, None
+
+def login(samples):
+    email = samples.rng.choice(list(samples.emails.values()))
+    return 'POST', '/api/auth/login', {}, {'email': email, 'password': PASSWORD}
+
+def me(samples):
+    headers, _ = samples.student()
+    return 'GET', '/api/auth/me', headers, None
+
+def catalog(samples):
+    headers, _ = samples.student()
+    return 'GET', '/api/courses?limit=50', headers, None
+
+def catalog_enrolled(samples):
+    headers, _ = samples.student()
+    return 'GET', '/api/courses?enrolled=true', headers, None
+
+def course_detail(samples):
+    headers, course_id = samples.student()
+    return 'GET', f'/api/courses/{course_id}', headers, None
+
+def my_courses(samples):
+    headers, _ = samples.student()
+    return 'GET', '/api/courses/my-courses', headers, None
+
+def course_progress(samples):
+    headers, course_id = samples.student()
+    return 'GET', f'/api/courses/{course_id}/progress', headers, None
+
+def progress_dashboard(samples):
+    headers, course_id = samples.instructor()
+    return 'GET', f'/api/courses/{course_id}/progress/students', headers, None
+
+def lesson_detail(samples):
+    headers, course_id = samples.student()
+    return 'GET', f'/api/lessons/{samples.lesson(course_id)}', headers, None
+
+def lesson_complete(samples):
+    headers, course_id = samples.student()
+    return 'POST', f'/api/lessons/{samples.lesson(course_id)}/complete', headers, None
+
+def progress_sync(samples):
+    headers, course_id = samples.student()
+    events = [{'lesson_id': lesson_id} for lesson_id in samples.lessons[course_id][:10]]
+    return 'POST', '/api/lessons/progress/sync', headers, {'events': events}
+
+def course_assignments(samples):
+    headers, course_id = samples.student()
+    return 'GET', f'/api/assignments?course_id={course_id}', headers, None
+
+def submit(samples):
+    headers, course_id = samples.student()
+    assignment_id = samples.assignment(course_id)
+    return 'POST', f'/api/assignments/{assignment_id}/submissions', headers, {'content': 'Benchmark answer'}
+
+def my_submissions(samples):
+    headers, course_id = samples.student()
+    return 'GET', f'/api/assignments/{samples.assignment(course_id)}/submissions/mine', headers, None
+
+def submissions(samples):
+    headers, course_id = samples.instructor()
+    return 'GET', f'/api/assignments/{samples.assignment(course_id)}/submissions', headers, None
+
+def grades(samples):
+    headers, course_id = samples.instructor()
+    assignment_id = samples.assignment(course_id)
+    entries = [
+        {'submission_id': submission_id, 'grade': samples.rng.randint(0, 100)}
+        for submission_id in samples.submissions.get(assignment_id, [])[:50]
+    ]
+    # an empty grades list is a 400, so fall back to an unknown submission
+    return 'PUT', f'/api/assignments/{assignment_id}/grades', headers, {
+        'grades': entries or [{'submission_id': 0, 'grade': None}]
+    }
+
+def export(samples):
+    headers, course_id = samples.instructor()
+    return 'GET', f'/api/exports/enrollments?format=ndjson&course_id={course_id}', headers, None
+
+# name, scenario, requests (login is bcrypt bound, so it gets fewer)
+SCENARIOS = [
+    ('health', health, None),
+    ('auth.login', login, 20),
+    ('auth.me', me, None),
+    ('courses.catalog', catalog, None),
+    ('courses.catalog_enrolled', catalog_enrolled, None),
+    ('courses.detail', course_detail, None),
+    ('courses.my_courses', my_courses, None),
+    ('courses.progress', course_progress, None),
+    ('courses.progress_dashboard', progress_dashboard, None),
+    ('lessons.detail', lesson_detail, None),
+    ('lessons.complete', lesson_complete, None),
+    ('lessons.progress_sync', progress_sync, None),
+    ('assignments.list', course_assignments, None),
+    ('assignments.submit', submit, None),
+    ('assignments.my_submissions', my_submissions, None),
+    ('assignments.submissions', submissions, None),
+    ('assignments.grades', grades, None),
+    ('exports.enrollments', export, None),
+]
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+def run_scenario(client, samples, scenario, requests, warmup):
+    """
+    Send warmup + requests requests of one scenario, one at a time
+
+    Returns:
+        dict: Latency percentiles (ms), req/s, queries per request and
+        the number of non-2xx responses
+    """
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    for _ in range(warmup):
+        method, url, headers, body = scenario(samples)
+        client.open(url, method=method, headers=headers, json=body).close()
+
+    latencies = []
+    failures = 0
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        for _ in range(requests):
+            method, url, headers, body = scenario(samples)
+            started = time.perf_counter()
+            response = client.open(url, method=method, headers=headers, json=body)
+            response.get_data()
+            latencies.append(time.perf_counter() - started)
+            response.close()
+            if response.status_code >= 300:
+                failures += 1
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+    latencies.sort()
+    return {
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'req_per_s': len(latencies) / sum(latencies),
+        'queries': len(statements) / requests,
+        'failures': failures
+    }
+
+def compare(results, baseline, tolerance):
+    """
+    List the regressions against a saved baseline
+
+    Returns:
+        list: One message per regressed endpoint
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if result['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{name}: p95 {before["p95_ms"]:.2f} -> {result["p95_ms"]:.2f} ms')
+        if result['queries'] > before['queries']:
+            regressions.append(f'{name}: queries {before["queries"]:.1f} -> {result["queries"]:.1f}')
+    return regressions
+
+def working_copy(database_uri, directory):
+    """
+    Copy a SQLite benchmark database, so the write endpoints never
+    change the generated data and every run starts from the same rows
+    """
+    url = make_url(database_uri)
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        return database_uri
+    path = os.path.join(directory, 'endpoints.db')
+    shutil.copyfile(url.database, path)
+    return f'sqlite:///{path}'
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database', default='sqlite:////tmp/lms_bench.db',
+                        help='Database generated by benchmarks.dataset')
+    parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--only', help='Comma separated endpoint names')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', help='Write the results as a JSON baseline')
+    parser.add_argument('--compare', help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative p95 increase before --compare fails')
+    args = parser.parse_args()
+
+    only = set(args.only.split(',')) if args.only else None
+    scenarios = [scenario for scenario in SCENARIOS if only is None or scenario[0] in only]
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_app({
+            'SQLALCHEMY_DATABASE_URI': working_copy(args.database, directory),
+            'DB_AUTO_MIGRATE': False,
+            'SUBMISSION_QUEUE_PATH': os.path.join(directory, 'submission_queue.db'),
+        })
+        client = app.test_client()
+
+        results = {}
+        print(f'{"endpoint":>28} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"req/s":>8} {"queries":>8} {"non-2xx":>8}')
+        with app.app_context():
+            samples = Samples(random.Random(args.seed))
+            for name, scenario, requests in scenarios:
+                requests = min(requests or args.requests, args.requests)
+                result = run_scenario(client, samples, scenario, requests, min(args.warmup, requests))
+                results[name] = result
+                print(
+                    f'{name:>28} {result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+                    f'{result["p99_ms"]:>8.2f} {result["req_per_s"]:>8.0f} '
+                    f'{result["queries"]:>8.1f} {result["failures"]:>8}'
+                )
+
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f'Baseline written to {args.save}')
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        if regressions:
+            sys.exit(1)
+        print(f'No regressions against {args.compare}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Index Usage Check
+Runs EXPLAIN QUERY PLAN on the statements the routes build and fails
+if any of them scans a table instead of using the designed indexes
+
+Usage (from the backend directory):
+    python -m benchmarks.explain_indexes
+"""
+
+import sys
+from datetime import datetime
+from sqlalchemy import select
+from app import create_app, db
+from app.models import Assignment, Enrollment, Lesson, Progress, Submission
+from app.routes.assignments import DEFAULT_SUBMISSION_FIELDS, submissions_page_query, submissions_query
+from app.routes.courses import CATALOG_FIELDS, catalog_page_query, catalog_query, my_courses_query
+
+STUDENT = {'user_id': 1, 'role': 'student'}
+INSTRUCTOR = {'user_id': 1, 'role': 'instructor', 'full_name': 'Instructor'}
+CURSOR = (datetime(2026, 1, 1), 1)
+PAGE_SIZE = 50
+
+# (description, statement builder, indexes the plan must use, indexes
+# it may SCAN in order); any other SCAN reads a whole table or index
+HOT_QUERIES = [
+    (
+        'catalog first page',
+        lambda: catalog_page_query(catalog_query(STUDENT, CATALOG_FIELDS), None, PAGE_SIZE),
+        ['ix_courses_created_at_id', 'ix_lessons_course_id_order_index'],
+        ['ix_courses_created_at_id']  # newest first, stops after one page
+    ),
+    (
+        'catalog page after a cursor',
+        lambda: catalog_page_query(catalog_query(STUDENT, CATALOG_FIELDS), CURSOR, PAGE_SIZE),
+        ['ix_courses_created_at_id', 'ix_lessons_course_id_order_index'],
+        []
+    ),
+    (
+        'my courses of a student',
+        lambda: my_courses_query(STUDENT)[1],
+        ['sqlite_autoindex_enrollments_1', 'ix_lessons_course_id_order_index'],
+        []
+    ),
+    (
+        'my courses of an instructor',
+        lambda: my_courses_query(INSTRUCTOR)[1],
+        ['ix_courses_instructor_id', 'ix_lessons_course_id_order_index', 'ix_enrollments_course_id'],
+        []
+    ),
+    (
+        'lessons of a course in order',
+        lambda: select(Lesson).where(Lesson.course_id == 1).order_by(Lesson.order_index),
+        ['ix_lessons_course_id_order_index'],
+        []
+    ),
+    (
+        'enrollments of a course',
+        lambda: select(Enrollment).where(Enrollment.course_id == 1),
+        ['ix_enrollments_course_id'],
+        []
+    ),
+    (
+        'enrollment of a student in a course',
+        lambda: select(Enrollment).where(Enrollment.student_id == 1, Enrollment.course_id == 1),
+        ['sqlite_autoindex_enrollments_1'],
+        []
+    ),
+    (
+        'progress rows of a lesson',
+        lambda: select(Progress).where(Progress.lesson_id == 1),
+        ['ix_progress_lesson_id'],
+        []
+    ),
+    (
+        'assignments of a course',
+        lambda: select(Assignment).where(Assignment.course_id == 1),
+        ['ix_assignments_course_id'],
+        []
+    ),
+    (
+        'submission of a student for an assignment',
+        lambda: select(Submission).where(Submission.assignment_id == 1, Submission.student_id == 1),
+        ['ix_submissions_assignment_id_student_id'],
+        []
+    ),
+    (
+        'submissions of an assignment page after a cursor',
+        lambda: submissions_page_query(submissions_query(1, DEFAULT_SUBMISSION_FIELDS), CURSOR, PAGE_SIZE),
+        ['ix_submissions_assignment_id_submitted_at'],
+        []
+    ),
+    (
+        'submissions of a student',
+        lambda: select(Submission).where(Submission.student_id == 1),
+        ['ix_submissions_student_id'],
+        []
+    ),
+]
+
+def query_plan(statement):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement"""
+    compiled = statement.compile(db.engine, compile_kwargs={'render_postcompile': True})
+    params = compiled.construct_params()
+    values = tuple(
+        value.isoformat(' ') if isinstance(value, datetime) else value
+        for value in (params[name] for name in compiled.positiontup)
+    )
+    rows = db.session.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', values).all()
+    return [row[-1] for row in rows]
+
+def check_plan(plan, indexes, scans):
+    """
+    Returns:
+        list: Problems with the plan (empty when it is fine)
+    """
+    problems = [f'does not use {index}' for index in indexes if not any(index in line for line in plan)]
+    problems += [
+        f'scans: {line}' for line in plan
+        if line.startswith('SCAN ') and not any(f'INDEX {index}' in line for index in scans)
+    ]
+    return problems
+
+def main():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    failures = 0
+
+    with app.app_context():
+        for description, build, indexes, scans in HOT_QUERIES:
+            plan = query_plan(build())
+            problems = check_plan(plan, indexes, scans)
+            failures += bool(problems)
+            print(f'[{"FAIL" if problems else "ok"}] {description}: {" | ".join(plan)}')
+            for problem in problems:
+                print(f'    {problem}')
+
+    if failures:
+        print(f'{failures} queries do not use their indexes')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""
+My Courses Query Benchmark
+Shows that GET /api/courses/my-courses runs a constant number of
+SQL statements no matter how many courses a user has, and that its
+latency depends on the user's courses, not on the rest of the catalog
+
+Usage (from the backend directory):
+    python -m benchmarks.my_courses_queries
+"""
+
+import statistics
+import time
+from sqlalchemy import event, insert
+from app import create_app, db
+from app.models import User, Course, Lesson, Enrollment
+from app.utils.auth import generate_token
+
+COURSE_COUNTS = [1, 10, 100, 1000]
+LESSONS_PER_COURSE = 5
+
+# courses of other instructors, each with lessons and enrollments,
+# so the counts have a realistic table to search
+OTHER_COURSES = [0, 5000]
+OTHER_LESSONS_PER_COURSE = 20
+OTHER_STUDENTS = 200
+OTHER_ENROLLMENTS_PER_COURSE = 20
+
+# timed calls per measurement (the median is reported)
+REPEATS = 20
+
+def seed_other_courses(course_count):
+    """
+    Create course_count courses the benchmark users have nothing to do with
+    """
+    if not course_count:
+        return
+
+    other = User(email='other@bench.test', password_hash='x',
+                 full_name='Other Instructor', role='instructor')
+    students = [
+        User(email=f'other-student-{i}@bench.test', password_hash='x',
+             full_name=f'Other Student {i}', role='student')
+        for i in range(OTHER_STUDENTS)
+    ]
+    db.session.add_all([other] + students)
+    db.session.flush()
+
+    db.session.execute(insert(Course), [
+        {'title': f'Other {i}', 'description': '', 'instructor_id': other.id}
+        for i in range(course_count)
+    ])
+    course_ids = db.session.query(Course.id).filter(Course.instructor_id == other.id).all()
+    db.session.execute(insert(Lesson), [
+        {'course_id': course_id, 'title': f'Lesson {index}', 'content': '', 'order_index': index}
+        for (course_id,) in course_ids
+        for index in range(OTHER_LESSONS_PER_COURSE)
+    ])
+    db.session.execute(insert(Enrollment), [
+        {'course_id': course_id, 'student_id': students[(course_id + offset) % OTHER_STUDENTS].id}
+        for (course_id,) in course_ids
+        for offset in range(OTHER_ENROLLMENTS_PER_COURSE)
+    ])
+    db.session.commit()
+
+def seed(course_count):
+    """
+    Create one instructor and one student sharing course_count courses
+    """
+    instructor = User(email='instructor@bench.test', password_hash='x',
+                      full_name='Bench Instructor', role='instructor')
+    student = User(email='student@bench.test', password_hash='x',
+                   full_name='Bench Student', role='student')
+    db.session.add_all([instructor, student])
+    db.session.flush()
+
+    course_list = [
+        Course(title=f'Course {i}', description='', instructor_id=instructor.id)
+        for i in range(course_count)
+    ]
+    db.session.add_all(course_list)
+    db.session.flush()
+
+    for course in course_list:
+        db.session.add(Enrollment(student_id=student.id, course_id=course.id))
+        for index in range(LESSONS_PER_COURSE):
+            db.session.add(Lesson(course_id=course.id, title=f'Lesson {index}',
+                                  content='', order_index=index))
+    db.session.commit()
+
+    return instructor, student
+
+def measure(client, token):
+    """
+    Call my-courses REPEATS times
+
+    Returns:
+        tuple: (status, course count, queries per call, median ms)
+    """
+    statements = []
+
+    def count(*args):
+        statements.append(args[2])
+
+    headers = {'Authorization': f'Bearer {token}'}
+    timings = []
+    event.listen(db.engine, 'before_cursor_execute', count)
+    try:
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            response = client.get('/api/courses/my-courses', headers=headers)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count)
+
+    return (
+        response.status_code,
+        len(response.get_json()['courses']),
+        len(statements) // REPEATS,
+        statistics.median(timings)
+    )
+
+def main():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+    client = app.test_client()
+
+    print(f'{"courses":>8} {"other":>6} {"role":>11} {"status":>7} {"queries":>8} {"median ms":>10}')
+    for other_count in OTHER_COURSES:
+        for course_count in COURSE_COUNTS:
+            with app.app_context():
+                db.drop_all()
+                db.create_all()
+                seed_other_courses(other_count)
+                instructor, student = seed(course_count)
+
+                for user in (student, instructor):
+                    token = generate_token(user.id, user.role)
+                    status, returned, queries, elapsed = measure(client, token)
+                    assert returned == course_count
+                    print(f'{course_count:>8} {other_count:>6} {user.role:>11} {status:>7} '
+                          f'{queries:>8} {elapsed:>10.2f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Serialization Benchmark
+Compares ORM objects + to_dict() + stdlib json with labeled column
+rows + RowSchema + the app's JSON provider for a catalog page
+
+Usage (from the backend directory):
+    python -m benchmarks.serialization
+"""
+
+import json
+import time
+from flask import current_app
+from sqlalchemy import func, select
+from app import create_app, db
+from app.models import User, Course
+from app.routes.courses import course_schema
+
+COURSE_COUNT = 5000
+PAGE_SIZES = [50, 200, 1000, 5000]
+ROUNDS = 20
+
+def seed():
+    """
+    Create one instructor with COURSE_COUNT courses
+    """
+    instructor = User(email='instructor@bench.test', password_hash='x',
+                      full_name='Bench Instructor', role='instructor')
+    db.session.add(instructor)
+    db.session.flush()
+
+    db.session.add_all([
+        Course(title=f'Course {i}', description='A course description ' * 10,
+               instructor_id=instructor.id)
+        for i in range(COURSE_COUNT)
+    ])
+    db.session.commit()
+
+def orm_page(limit):
+    """Previous path: load entities, call to_dict() and json.dumps"""
+    rows = (
+        db.session.query(Course, User.full_name)
+        .outerjoin(User, User.id == Course.instructor_id)
+        .order_by(Course.created_at.desc(), Course.id.desc())
+        .limit(limit)
+        .all()
+    )
+    courses = []
+    for course, instructor_name in rows:
+        course_dict = course.to_dict()
+        course_dict['instructor_name'] = instructor_name or 'Unknown'
+        courses.append(course_dict)
+    db.session.expunge_all()
+    return json.dumps({'status': 'success', 'courses': courses})
+
+def row_page(limit, schema):
+    """Current path: labeled columns, RowSchema.dump and app.json"""
+    rows = db.session.execute(
+        select(*schema.columns())
+        .select_from(Course)
+        .outerjoin(User, User.id == Course.instructor_id)
+        .order_by(Course.created_at.desc(), Course.id.desc())
+        .limit(limit)
+    )
+    return current_app.json.dumps({
+        'status': 'success',
+        'courses': schema.dump(rows)
+    })
+
+def timed(fn, *args):
+    """Return the mean milliseconds of ROUNDS calls"""
+    db.session.expunge_all()
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn(*args)
+    return (time.perf_counter() - started) * 1000 / ROUNDS
+
+def main():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+
+    with app.app_context():
+        db.create_all()
+        seed()
+
+        schema = course_schema(instructor_name=func.coalesce(User.full_name, 'Unknown'))
+
+        # both paths must produce the same document
+        assert json.loads(orm_page(10)) == json.loads(row_page(10, schema))
+
+        print(f'{"rows":>6} {"to_dict ms":>11} {"RowSchema ms":>13} {"speedup":>8}')
+        for limit in PAGE_SIZES:
+            orm_ms = timed(orm_page, limit)
+            row_ms = timed(row_page, limit, schema)
+            print(f'{limit:>6} {orm_ms:>11.2f} {row_ms:>13.2f} {orm_ms / row_ms:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
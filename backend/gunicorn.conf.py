@@ -0,0 +1,133 @@
+"""
+Gunicorn Configuration
+Prefork production server for wsgi:app, tuned through the environment
+
+Usage (from the backend directory):
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Reload code and config gracefully with 'kill -HUP <master pid>':
+new workers are started before the old ones finish their requests.
+"""
+
+import glob
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+cpu_count = multiprocessing.cpu_count()
+
+# where to listen (Render and most PaaS set PORT)
+bind = os.environ.get('GUNICORN_BIND', f'0.0.0.0:{os.environ.get("PORT", "5000")}')
+
+# worker processes: (2 x cores) + 1 unless WEB_CONCURRENCY is set
+workers = env_int('WEB_CONCURRENCY', cpu_count * 2 + 1)
+
+# 'gthread' (threads per worker) or 'gevent' (async, for I/O bound load:
+# handlers waiting on the database or network yield instead of pinning
+# a thread; needs 'pip install gevent', database waits are made
+# cooperative by app/utils/cooperative.py)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = env_int('GUNICORN_THREADS', 4)                       # gthread only
+worker_connections = env_int('GUNICORN_WORKER_CONNECTIONS', 1000)  # gevent only
+
+# each worker builds its own app with create_app() after the fork,
+# so no database connection or thread is shared between processes
+preload_app = False
+
+# keep idle client connections open (keep it above the idle timeout of
+# a load balancer in front, so it never reuses a closed connection)
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)
+
+# kill workers stuck on one request, give draining workers time on reload
+timeout = env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+# recycle workers now and then (bounds slow leaks), staggered by jitter
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+# worker heartbeat files in memory (disk-backed /tmp can stall on containers)
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None  # '' disables
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+# /metrics snapshot files of the workers (METRICS_DIR); by default one
+# directory per master, so servers on one host never mix their numbers
+default_metrics_dir = os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+    f'lms-metrics-{os.getpid()}'
+)
+metrics_dir = os.environ.get('METRICS_DIR') or default_metrics_dir
+
+# the read cache has to be shared by the workers: an edit invalidates
+# the cache of the worker that served it only, so with one LRU per
+# worker ('memory') the others would keep serving the old data (and
+# answering 304 to it) until CACHE_TTL. By default the workers share a
+# SQLite file per master ('sqlite', see app/config.py).
+cache_backend = os.environ.setdefault('CACHE_BACKEND', 'sqlite')
+if cache_backend == 'memory' and workers > 1:
+    raise RuntimeError(
+        "CACHE_BACKEND='memory' keeps one cache per worker, which serves stale "
+        "data with more than one worker; use 'sqlite' or a shared backend"
+    )
+default_cache_path = os.path.join(
+    '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+    f'lms-cache-{os.getpid()}.db'
+)
+cache_path = os.environ.setdefault('CACHE_PATH', default_cache_path)
+
+def on_starting(server):
+    """
+    Apply pending migrations once, in a separate process, before any
+    worker starts; workers then skip DB_AUTO_MIGRATE so they do not
+    race each other on the schema. Then start the workers with an
+    empty metrics directory and read cache.
+    """
+    if os.environ.get('DB_AUTO_MIGRATE', '1').lower() not in ('0', 'false', 'no', 'off'):
+        server.log.info('Applying database migrations')
+        subprocess.run(
+            [sys.executable, '-c', 'from app import create_app; create_app()'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=dict(os.environ, METRICS_ENABLED='0'),
+            check=True
+        )
+        os.environ['DB_AUTO_MIGRATE'] = '0'
+
+    os.makedirs(metrics_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(metrics_dir, '*.json')):
+        os.remove(path)
+    os.environ['METRICS_DIR'] = metrics_dir
+
+    if cache_backend == 'sqlite':
+        remove_cache_files()
+
+def post_worker_init(worker):
+    """Drain submissions left in the queue as soon as the worker is up"""
+    from app.utils.ingest import autostart_drain_worker
+    autostart_drain_worker(worker.wsgi)
+
+def child_exit(server, worker):
+    """Keep the counters of an exited worker and drop its gauges"""
+    from app.utils.metrics import mark_process_dead
+    mark_process_dead(metrics_dir, worker.pid)
+
+def remove_cache_files():
+    for path in (cache_path, f'{cache_path}-wal', f'{cache_path}-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+def on_exit(server):
+    if metrics_dir == default_metrics_dir:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+    if cache_backend == 'sqlite' and cache_path == default_cache_path:
+        remove_cache_files()
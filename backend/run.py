@@ -1,9 +1,14 @@
 """
 Application Entry Point
 Runs the Flask development server
+
+Production: gunicorn -c gunicorn.conf.py wsgi:app (see gunicorn.conf.py)
 """
 
+import os
 from app import create_app
+from app.config import env_bool
+from app.utils.ingest import autostart_drain_worker
 
 # create Flask app instance
 app = create_app()
@@ -14,8 +19,14 @@ if __name__ == '__main__':
     print("Health check: http://localhost:5000/api/health")
     print("=" * 50)
 
+    debug = env_bool('FLASK_DEBUG', True)
+
+    # with the reloader this script runs twice; only the child serves
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        autostart_drain_worker(app)
+
     app.run(
         host='0.0.0.0',  # accept connections from any IP
         port=5000,       # backend runs on port 5000
-        debug=True       # auto-reload on code changes
+        debug=debug      # auto-reload on code changes
     )
\ No newline at end of file
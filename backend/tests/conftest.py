@@ -0,0 +1,118 @@
+"""
+Test Fixtures
+App on a fresh in-memory SQLite database (migrated like a real one),
+test client and account/course helpers
+"""
+
+import pytest
+from app import create_app, db
+
+PASSWORD = 'secret-password'
+
+@pytest.fixture
+def app():
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
+        'BCRYPT_ROUNDS': 4,
+        'SUBMISSION_QUEUE_WORKER': False,
+        'METRICS_TOKEN': ''
+    })
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def register(client):
+    """
+    Register an account
+
+    Returns:
+        function: register(email, role='student') -> (auth headers, user ID)
+    """
+    def register(email, role='student'):
+        response = client.post('/api/auth/register', json={
+            'email': email,
+            'password': PASSWORD,
+            'full_name': email.split('@')[0],
+            'role': role
+        })
+        assert response.status_code == 201, response.json
+        return {'Authorization': f'Bearer {response.json["token"]}'}, response.json['user']['id']
+    return register
+
+@pytest.fixture
+def instructor(register):
+    return register('instructor@example.com', 'instructor')
+
+@pytest.fixture
+def student(register):
+    return register('student@example.com')
+
+@pytest.fixture
+def create_course(client, instructor):
+    """
+    Create a course of the instructor fixture
+
+    Returns:
+        function: create_course(title='Course') -> course ID
+    """
+    def create_course(title='Course'):
+        response = client.post('/api/courses', json={'title': title}, headers=instructor[0])
+        assert response.status_code == 201, response.json
+        return response.json['course']['id']
+    return create_course
+
+@pytest.fixture
+def create_lesson(client, instructor):
+    """
+    Returns:
+        function: create_lesson(course_id, order_index) -> lesson ID
+    """
+    def create_lesson(course_id, order_index):
+        response = client.post('/api/lessons', json={
+            'course_id': course_id,
+            'title': f'Lesson {order_index}',
+            'content': 'content',
+            'order_index': order_index
+        }, headers=instructor[0])
+        assert response.status_code == 201, response.json
+        return response.json['lesson']['id']
+    return create_lesson
+
+@pytest.fixture
+def course(create_course):
+    return create_course()
+
+@pytest.fixture
+def enroll(client):
+    """
+    Returns:
+        function: enroll(headers, course_id) -> response
+    """
+    def enroll(headers, course_id):
+        return client.post(f'/api/courses/{course_id}/enroll', headers=headers)
+    return enroll
+
+@pytest.fixture
+def create_assignment(client, instructor):
+    """
+    Returns:
+        function: create_assignment(course_id, **fields) -> assignment ID
+    """
+    def create_assignment(course_id, **fields):
+        response = client.post('/api/assignments', json={
+            'course_id': course_id,
+            'title': 'Assignment',
+            'description': 'description',
+            **fields
+        }, headers=instructor[0])
+        assert response.status_code == 201, response.json
+        return response.json['assignment']['id']
+    return create_assignment
@@ -0,0 +1,56 @@
+"""
+Bulk Enrollment Tests
+Rosters with duplicates, unknown entries and malformed bodies
+"""
+
+import pytest
+
+def test_roster_with_duplicates(client, course, instructor, student, register, enroll):
+    other_headers, other_id = register('other@example.com')
+    _, instructor_id = instructor
+    enroll(student[0], course)
+
+    response = client.post(f'/api/courses/{course}/enrollments/bulk', json={
+        'student_ids': [student[1], other_id, other_id, instructor_id, 999],
+        'emails': ['OTHER@example.com', 'nobody@example.com']
+    }, headers=instructor[0])
+
+    assert response.status_code == 200, response.json
+    assert response.json['counts'] == {
+        'received': 7,
+        'created': 1,      # other
+        'skipped': 1,      # already enrolled
+        'duplicates': 2,   # other again, by ID and by email
+        'invalid': 3       # instructor, unknown ID and email
+    }
+
+    progress = client.get(f'/api/courses/{course}/progress', headers=other_headers)
+    assert progress.status_code == 200
+
+def test_csv_roster(client, course, instructor, student):
+    response = client.post(
+        f'/api/courses/{course}/enrollments/bulk',
+        data=f'email,student_id\n,{student[1]}\nstudent@example.com,\n',
+        content_type='text/csv',
+        headers=instructor[0]
+    )
+
+    assert response.status_code == 200, response.json
+    assert response.json['counts']['created'] == 1
+    assert response.json['counts']['duplicates'] == 1
+
+@pytest.mark.parametrize('body', [
+    [1, 2],
+    {'student_ids': '123'},
+    {'student_ids': [True]},
+    {'emails': [1]},
+    {}
+])
+def test_malformed_roster(client, course, instructor, body):
+    response = client.post(f'/api/courses/{course}/enrollments/bulk', json=body, headers=instructor[0])
+    assert response.status_code == 400
+
+def test_only_own_courses(client, course, register):
+    headers, _ = register('someone@example.com', 'instructor')
+    response = client.post(f'/api/courses/{course}/enrollments/bulk', json={'student_ids': [1]}, headers=headers)
+    assert response.status_code == 403
@@ -0,0 +1,49 @@
+"""
+Conditional GET Tests
+ETag revalidation of the catalog and course detail
+"""
+
+def revalidate(client, url, headers):
+    first = client.get(url, headers=headers)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    return etag, client.get(url, headers={**headers, 'If-None-Match': etag})
+
+def test_catalog_not_modified(client, course, student):
+    etag, response = revalidate(client, '/api/courses', student[0])
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+
+def test_catalog_etag_changes_with_courses(client, create_course, create_lesson, instructor, student):
+    course_id = create_course()
+    seen = {revalidate(client, '/api/courses', student[0])[0]}
+
+    def changed():
+        etag = client.get('/api/courses', headers=student[0]).headers['ETag']
+        assert etag not in seen
+        seen.add(etag)
+
+    client.put(f'/api/courses/{course_id}', json={'title': 'Renamed'}, headers=instructor[0])
+    changed()
+    lesson_id = create_lesson(course_id, 1)
+    changed()
+    client.delete(f'/api/lessons/{lesson_id}', headers=instructor[0])
+    changed()
+    client.post(f'/api/courses/{course_id}/enroll', headers=student[0])
+    changed()
+    client.delete(f'/api/courses/{course_id}', headers=instructor[0])
+    changed()
+
+def test_course_detail_not_modified_until_edited(client, course, instructor, student, enroll):
+    enroll(student[0], course)
+    url = f'/api/courses/{course}'
+    etag, response = revalidate(client, url, student[0])
+    assert response.status_code == 304
+
+    client.put(url, json={'title': 'Renamed'}, headers=instructor[0])
+
+    response = client.get(url, headers={**student[0], 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['course']['title'] == 'Renamed'
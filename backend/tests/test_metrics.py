@@ -0,0 +1,28 @@
+"""
+Metrics Endpoint Tests
+Prometheus text output and the scrape token
+"""
+
+def test_request_counts(client, student):
+    client.get('/api/courses', headers=student[0])
+
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'lms_http_requests_total{blueprint="courses",route="/api/courses",method="GET",status="200"} 1' in text
+    assert 'lms_http_request_duration_seconds_bucket' in text
+
+def test_queue_depth_with_queued_ingest(app, client, tmp_path):
+    app.config.update(SUBMISSION_INGEST='queue', SUBMISSION_QUEUE_PATH=str(tmp_path / 'queue.db'))
+
+    text = client.get('/metrics').get_data(as_text=True)
+
+    assert 'lms_submission_queue_depth 0' in text
+
+def test_metrics_token(app, client):
+    app.config['METRICS_TOKEN'] = 'scrape-token'
+
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'}).status_code == 200
@@ -0,0 +1,46 @@
+"""
+Cursor Pagination Tests
+Catalog and submission listings walked page by page
+"""
+
+def walk(client, url, headers, key):
+    items, pages, cursor = [], 0, None
+    while True:
+        response = client.get(url, query_string={'limit': 2, 'cursor': cursor} if cursor else {'limit': 2},
+                              headers=headers)
+        assert response.status_code == 200, response.json
+        items += response.json[key]
+        pages += 1
+        cursor = response.json['next_cursor']
+        if cursor is None:
+            return items, pages
+
+def test_catalog_pages_newest_first(client, create_course, student):
+    course_ids = [create_course(f'Course {i}') for i in range(5)]
+
+    courses, pages = walk(client, '/api/courses', student[0], 'courses')
+
+    assert [course['id'] for course in courses] == course_ids[::-1]
+    assert pages == 3
+
+def test_catalog_rejects_bad_cursor(client, student):
+    response = client.get('/api/courses', query_string={'cursor': 'not-a-cursor'}, headers=student[0])
+    assert response.status_code == 400
+
+def test_catalog_rejects_bad_limit(client, student):
+    response = client.get('/api/courses', query_string={'limit': 'many'}, headers=student[0])
+    assert response.status_code == 400
+
+def test_submissions_pages_oldest_first(client, course, create_assignment, instructor, student, enroll):
+    enroll(student[0], course)
+    assignment = create_assignment(course)
+    submission_ids = [
+        client.post(f'/api/assignments/{assignment}/submissions', json={'content': f'answer {i}'},
+                    headers=student[0]).json['submission']['id']
+        for i in range(5)
+    ]
+
+    submissions, pages = walk(client, f'/api/assignments/{assignment}/submissions', instructor[0], 'submissions')
+
+    assert [submission['id'] for submission in submissions] == submission_ids
+    assert pages == 3
@@ -0,0 +1,68 @@
+"""
+Progress Tests
+Lesson completion and offline sync are idempotent, and the course
+rollup follows them
+"""
+
+def course_progress(client, headers, course_id):
+    response = client.get(f'/api/courses/{course_id}/progress', headers=headers)
+    assert response.status_code == 200, response.json
+    return response.json['progress']
+
+def test_complete_twice_counts_once(client, course, create_lesson, student, enroll):
+    enroll(student[0], course)
+    lesson_id = create_lesson(course, 1)
+    create_lesson(course, 2)
+
+    for _ in range(2):
+        response = client.post(f'/api/lessons/{lesson_id}/complete', headers=student[0])
+        assert response.status_code == 200
+        assert response.json['progress']['completed'] is True
+
+    progress = course_progress(client, student[0], course)
+    assert progress['completed_lessons'] == 1
+    assert progress['total_lessons'] == 2
+
+def test_complete_requires_enrollment(client, course, create_lesson, student):
+    lesson_id = create_lesson(course, 1)
+
+    assert client.post(f'/api/lessons/{lesson_id}/complete', headers=student[0]).status_code == 403
+    assert client.post('/api/lessons/999/complete', headers=student[0]).status_code == 404
+
+def test_sync_replay_is_idempotent(client, course, create_lesson, student, enroll):
+    enroll(student[0], course)
+    first, second = create_lesson(course, 1), create_lesson(course, 2)
+    events = [
+        {'lesson_id': first, 'completed_at': '2026-01-01T10:00:00Z'},
+        {'lesson_id': first, 'completed_at': '2026-01-01T09:00:00Z'},
+        {'lesson_id': second, 'completed_at': '2026-01-02T10:00:00Z'},
+        {'lesson_id': 999}
+    ]
+
+    response = client.post('/api/lessons/progress/sync', json={'events': events}, headers=student[0])
+    assert response.status_code == 200
+    assert response.json['applied'] == [first, second]
+    assert response.json['rejected'] == [999]
+
+    replay = client.post('/api/lessons/progress/sync', json={'events': events}, headers=student[0])
+    assert replay.status_code == 200
+    assert replay.json['applied'] == []
+    assert replay.json['unchanged'] == [first, second]
+
+    progress = course_progress(client, student[0], course)
+    assert progress['completed_lessons'] == 2
+    assert progress['last_activity'] == '2026-01-02T10:00:00'
+
+def test_lesson_delete_recounts_rollup(client, course, create_lesson, instructor, student, enroll):
+    enroll(student[0], course)
+    first, second = create_lesson(course, 1), create_lesson(course, 2)
+    client.post('/api/lessons/progress/sync', json={'events': [
+        {'lesson_id': first, 'completed_at': '2026-01-01T10:00:00Z'},
+        {'lesson_id': second, 'completed_at': '2026-01-02T10:00:00Z'}
+    ]}, headers=student[0])
+
+    assert client.delete(f'/api/lessons/{second}', headers=instructor[0]).status_code == 200
+
+    progress = course_progress(client, student[0], course)
+    assert progress['completed_lessons'] == 1
+    assert progress['last_activity'] == '2026-01-01T10:00:00'
@@ -0,0 +1,57 @@
+"""
+Queued Submission Tests
+SUBMISSION_INGEST = 'queue': 202 with a receipt, stored by the drain
+"""
+
+import pytest
+from app.utils.ingest import drain_submissions, get_submission_queue
+
+@pytest.fixture
+def app(app, tmp_path):
+    app.config.update(SUBMISSION_INGEST='queue', SUBMISSION_QUEUE_PATH=str(tmp_path / 'queue.db'))
+    return app
+
+@pytest.fixture
+def assignment(course, create_assignment):
+    return create_assignment(course)
+
+def drain(app):
+    with app.app_context():
+        queue = get_submission_queue()
+        drain_submissions(queue, 10)
+        return queue.stats()
+
+def test_submit_is_accepted_then_stored(app, client, course, assignment, student, enroll):
+    enroll(student[0], course)
+
+    response = client.post(f'/api/assignments/{assignment}/submissions', json={'content': 'answer'},
+                           headers=student[0])
+    assert response.status_code == 202
+    receipt_id = response.json['receipt']['receipt_id']
+
+    receipt = client.get(f'/api/assignments/receipts/{receipt_id}', headers=student[0]).json['receipt']
+    assert receipt['status'] == 'queued'
+
+    assert drain(app)['stored'] == 1
+
+    receipt = client.get(f'/api/assignments/receipts/{receipt_id}', headers=student[0]).json['receipt']
+    assert receipt['status'] == 'stored'
+    assert receipt['submission']['id'] == receipt['submission_id']
+    assert receipt['submission']['student_id'] == student[1]
+
+def test_receipts_are_private(client, course, assignment, student, register, enroll):
+    enroll(student[0], course)
+    other_headers, _ = register('other@example.com')
+
+    response = client.post(f'/api/assignments/{assignment}/submissions', json={'content': 'answer'},
+                           headers=student[0])
+    receipt_id = response.json['receipt']['receipt_id']
+
+    assert client.get(f'/api/assignments/receipts/{receipt_id}', headers=other_headers).status_code == 404
+
+def test_unenrolled_student_is_refused_before_queueing(app, client, assignment, student):
+    response = client.post(f'/api/assignments/{assignment}/submissions', json={'content': 'answer'},
+                           headers=student[0])
+
+    assert response.status_code == 403
+    assert drain(app)['queued'] == 0
@@ -0,0 +1,13 @@
+"""
+WSGI Entry Point
+Production app object, served by gunicorn (see gunicorn.conf.py)
+
+Usage (from the backend directory):
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import create_app
+
+# every gunicorn worker imports this module after the fork,
+# so each process builds its own app, engine and caches
+app = create_app()